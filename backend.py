@@ -1,23 +1,59 @@
 import sqlite3
-import datetime
+import atexit
+import logging
+import sys
+import time
 
 DB = "food_db.db"
+RETRIES = 5  # so lan thu lai khi db dang bi khoa (busy/locked)
+
+log = logging.getLogger(__name__)
+
+_conn = None
 
 def connect():
-    conn = sqlite3.connect(DB)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # mo 1 lan, dung lai cho moi query
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB, check_same_thread = False, isolation_level = None,
+                                cached_statements = 512)
+        _conn.row_factory = sqlite3.Row
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("PRAGMA temp_store=MEMORY")
+        _conn.execute("PRAGMA mmap_size=268435456")
+        _conn.execute("PRAGMA cache_size=-64000")
+    return _conn
+
+def close():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
 
-def exe_query(query, param = None, commit = False, fetch_one = False):
+atexit.register(close)
+
+def execute_retry(conn, query, param):
+    # db bi khoa boi writer khac thi doi 1ms, 2ms, 4ms... roi thu lai
+    for attempt in range(RETRIES):
+        try:
+            # conn.execute dung cursor ngam, khong can tao cursor rieng
+            return conn.execute(query, param)
+        except sqlite3.OperationalError as e:
+            msg = str(e)
+            if attempt == RETRIES - 1 or ("locked" not in msg and "busy" not in msg):
+                raise
+            time.sleep(0.001 * 2 ** attempt)
+
+def exe_query(query, param = None, commit = False, fetch_one = False, fetch_rows = False):
     conn = connect()
-    cur = conn.cursor()
     result = None
     
     try:
-        if param:
-            cur.execute(query, param)
-        else:
-            cur.execute(query)
+        cur = execute_retry(conn, query, param or ())
+        if fetch_rows:
+            # tra ve tuple thuong, khong tao sqlite3.Row cho tung dong
+            cur.row_factory = None
 
         if commit:
             conn.commit()
@@ -28,113 +64,162 @@ def exe_query(query, param = None, commit = False, fetch_one = False):
             result = cur.fetchall()
     
     except sqlite3.Error as e:
-        print(e)
+        log.warning("DB error: %s", e)
         if commit:
             conn.rollback()
         result = None
     
-    finally:
-        conn.close()
-    
     return result
 
-class Cus_manager: 
+class Cus_manager:
+    Q_ADD = "INSERT INTO Customers (cus_name, cus_phone) VALUES (?,?)"
+    Q_REMOVE = "DELETE FROM Customers WHERE cus_id = ?"
+    Q_FIND = "SELECT cus_id, cus_name, cus_phone FROM Customers WHERE cus_phone = ?"
+    Q_LIST = "SELECT cus_id, cus_name, cus_phone FROM Customers"
+
     def add(self, name, phone):
-        query = "INSERT INTO CUstomers (cus_name, cus_phone) VALUES (?,?)"
-        return exe_query(query, (name, phone), commit = True)
+        return exe_query(self.Q_ADD, (name, phone), commit = True)
     
     def remove(self, cus_id):
-        query = "DELETE FROM Customers WHERE cus_id = ?"
-        return exe_query(query, (cus_id,), commit = True)
+        return exe_query(self.Q_REMOVE, (cus_id,), commit = True)
     
     def find_cus(self, phone):
-        query = "SELECT cus_id, cus_name, cus_phone FROM Customers WHERE cus_phone = ?"
-        return exe_query(query, (phone,), fetch_one = True)
+        return exe_query(self.Q_FIND, (phone,), fetch_one = True)
     
     def list_cus(self):
-        query = "SELECT cus_id, cus_name, cus_phone FROM Customers"
-        return exe_query(query, ())
+        return exe_query(self.Q_LIST, (), fetch_rows = True)
     
 class Emp_manager:
+    Q_ADD = "INSERT INTO Employees (emp_name) VALUES (?)"
+    Q_REMOVE = "DELETE FROM Employees WHERE emp_id = ?"
+    Q_LIST = "SELECT emp_id, emp_name FROM Employees"
+    Q_COUNT_BILL = """SELECT e.emp_id, e.emp_name,
+        COUNT(b.bill_id) AS orders_served,
+        COALESCE(SUM(b.total_amount), 0) AS total_sales
+        FROM Employees e
+        LEFT JOIN Bills b ON e.emp_id = b.emp_id
+        GROUP BY e.emp_id, e.emp_name
+        ORDER BY orders_served DESC, total_sales DESC"""
+
     def add(self, name):
-        query = "INSERT INTO Employees (emp_name) VALUES (?)"
-        return exe_query(query, (name,), commit = True)
+        return exe_query(self.Q_ADD, (name,), commit = True)
     
     def remove(self, emp_id):
-        query = "DELETE FROM Employees WHERE emp_id = ?"
-        return exe_query(query, (emp_id,), commit = True)
+        return exe_query(self.Q_REMOVE, (emp_id,), commit = True)
     
     def list_emp(self):
-        query = "SELECT emp_id, emp_name FROM Employees"
-        return exe_query(query, ())
+        return exe_query(self.Q_LIST, (), fetch_rows = True)
     
     def count_bill(self):
-        query = """SELECT Employeess.emp_id, emp_name
-        COUNT(Bills.bill_id) AS orders_served
-        FROM Employees
-        LEFT JOIN Bills ON Employees.emp_id = Bills.emp_id
-        GROUP BY emp_id, emp_name
-        ODRDER BY orders_served"""
-        return exe_query(query, ())
+        return exe_query(self.Q_COUNT_BILL, ())
     
 class Dish_manager:
+    Q_ADD = "INSERT INTO Dishes (dish_name) VALUES (?)"
+    Q_REMOVE = "DELETE FROM Dishes WHERE dish_id = ?"
+    Q_LIST = "SELECT dish_id, dish_name, recipe, cooking_time, dish_price FROM Dishes"
+
     def add(self, name):
-        query = "INSERT INTO  Dishes (dish_name) VALUES (?)"
-        return exe_query(query, (name,), commit = True)
+        return exe_query(self.Q_ADD, (name,), commit = True)
     
     def remove(self, dish_id):
-        query = "DELETE FROM Dishes WHERE dish_id = ?"
-        return exe_query(query, (dish_id,), commit = True)
+        return exe_query(self.Q_REMOVE, (dish_id,), commit = True)
     
     def list_dishes(self):
-        query = "SELECT dish_id, dish_name, recipe, cooking_time, dish_price FROM Dishes"
-        return exe_query(query, ())
+        return exe_query(self.Q_LIST, (), fetch_rows = True)
     
 class Ingredient_manager:
+    Q_ADD = "INSERT INTO Ingredients (ingre_name, stock, unit, expiry, suppliers) VALUES (?, ?, ?, ?, ?)"
+    Q_GET_ALL = "SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers FROM Ingredients"
+    Q_UPDATE_STOCK = "UPDATE Ingredients SET stock = ? WHERE ingre_id = ?"
+
     def add(self, name, stock, unit, expiry, suppliers):
-        query = "INSERT INTO Ingredients (ingre_name, stock, unit, expiry, suppliers) VALUES (?, ?, ?, ?, ?)"
-        return exe_query(query, (name, stock, unit, expiry, suppliers), commit=True)
+        return exe_query(self.Q_ADD, (name, stock, unit, expiry, suppliers), commit=True)
     
     def get_all(self):
-        query = "SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers FROM Ingredients"
-        return exe_query(query, ())
+        return exe_query(self.Q_GET_ALL, (), fetch_rows = True)
     
     def update_stock(self, ingre_id, new_stock):
-        query = "UPDATE Ingredients SET stock = ? WHERE ingre_id = ?"
-        return exe_query(query, (new_stock, ingre_id), commit=True)
+        return exe_query(self.Q_UPDATE_STOCK, (new_stock, ingre_id), commit=True)
     
     def used_stock(self):
         #cai nay lam sau luoi qua
         pass
 
 class Shipper_manager:
+    Q_GET_ALL = "SELECT shipper_id, shipper_info FROM Shippers"
+
     def get_all(self):
-        query = "SELECT shipper_id, shipper_info FROM Shippers"
-        return exe_query(query, ())
-
-cus_manager = Cus_manager()
-while True:
-    print("1. add customer")
-    print("2. remove customer")
-    print("3. find customer")
-    print("4. list customers")
-    print("q. back")
-    choice = input("chọn: ")
-    
-    if choice == "1":
-        name = input("tên: ")
-        phone = input("dth: ")
-        cus_manager.add(name, phone)
-    elif choice == "2":
-        cus_id = int(input("Customer ID to remove: "))
-        cus_manager.remove(cus_id)
-    elif choice == "3":
-        phone = input("Customer phone: ")
-        result = cus_manager.find_cus(phone)
-        print(result)
-    elif choice == "4":
-        result = cus_manager.list_cus()
-        for row in result:
-            print(dict(row))
-    elif choice == "q":
-        break
+        return exe_query(self.Q_GET_ALL, (), fetch_rows = True)
+
+MANAGERS = (Cus_manager, Emp_manager, Dish_manager, Ingredient_manager, Shipper_manager)
+
+def check_queries():
+    # EXPLAIN het cac cau Q_* luc khoi dong, sai SQL thi bao loi ngay
+    conn = connect()
+    for manager in MANAGERS:
+        for name, query in vars(manager).items():
+            if not name.startswith("Q_"):
+                continue
+            try:
+                conn.execute("EXPLAIN " + query, (None,) * query.count("?"))
+            except sqlite3.Error as e:
+                raise RuntimeError(f"{manager.__name__}.{name}: {e}") from e
+
+def _do_add(cus_manager, ask):
+    name = ask("tên: ")
+    phone = ask("dth: ")
+    cus_manager.add(name, phone)
+
+def _do_remove(cus_manager, ask):
+    cus_id = int(ask("Customer ID to remove: "))
+    cus_manager.remove(cus_id)
+
+def _do_find(cus_manager, ask):
+    phone = ask("Customer phone: ")
+    result = cus_manager.find_cus(phone)
+    print(result)
+
+def _do_list(cus_manager, ask):
+    # loi db thi list_cus tra ve None, coi nhu danh sach rong
+    for cus_id, name, phone in cus_manager.list_cus() or ():
+        print(cus_id, name, phone)
+
+HANDLERS = {"1": _do_add, "2": _do_remove, "3": _do_find, "4": _do_list}
+
+MENU = """1. add customer
+2. remove customer
+3. find customer
+4. list customers
+q. back"""
+
+def make_ask():
+    # go tay thi dung input(), con stdin la pipe thi doc het 1 lan roi lay tung dong
+    if sys.stdin.isatty():
+        return input
+    lines = iter(sys.stdin.read().splitlines())
+    def ask(prompt):
+        print(prompt, end = "")
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError from None
+    return ask
+
+def main():
+    check_queries()
+    cus_manager = Cus_manager()
+    ask = make_ask()
+    while True:
+        print(MENU)
+        try:
+            choice = ask("chọn: ")
+            if choice == "q":
+                break
+            handler = HANDLERS.get(choice)
+            if handler:
+                handler(cus_manager, ask)
+        except EOFError:
+            break
+
+if __name__ == "__main__":
+    main()
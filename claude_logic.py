@@ -4,15 +4,28 @@ Improved version with better error handling, logging, type hints, and features
 """
 
 import sqlite3
-import datetime
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+import atexit
+import functools
+import re
+import sys
+import threading
+import time
+from typing import Optional, List, Dict, Any, Tuple, Iterable, Iterator, Callable, Sequence, Collection
+from collections import namedtuple
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
 
+from pool import SQLiteConnectionPool
+
 # --- Configuration ---
 DATABASE_NAME = "food_db.db"
+ITER_ARRAYSIZE = 1000  # rows fetched per step when streaming results
+POOL_SIZE = 8  # max open connections per database
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)  # INSERT ... RETURNING
+IN_CHUNK_SIZE = 500  # ids bound per "IN (...)" lookup, well under SQLite's variable limit
 
 # --- Setup Logging ---
 logging.basicConfig(
@@ -30,6 +43,8 @@ class OrderStatus(Enum):
     DELIVERED = "Delivered"
     CANCELLED = "Cancelled"
 
+_VALID_STATUSES = frozenset(s.value for s in OrderStatus)
+
 # --- Data Classes ---
 @dataclass
 class Customer:
@@ -63,36 +78,279 @@ class Ingredient:
     expiry: str
     suppliers: str
 
+# --- Row Types ---
+# Lightweight rows for typed reads (get_all(typed=True) etc.); a manager's
+# ROW_TYPE fields are also the columns its generated SELECTs read
+CustomerRow = namedtuple("CustomerRow", "cus_id cus_name cus_phone")
+EmployeeRow = namedtuple("EmployeeRow", "emp_id emp_name")
+DishRow = namedtuple("DishRow", "dish_id dish_name recipe cooking_time dish_price")
+IngredientRow = namedtuple(
+    "IngredientRow", "ingre_id ingre_name stock unit expiry suppliers"
+)
+ShipperRow = namedtuple("ShipperRow", "shipper_id shipper_info")
+OrderDetailRow = namedtuple(
+    "OrderDetailRow",
+    "order_id dish_req total_price order_time status cus_name cus_phone"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _row_factory(row_type: type) -> Callable[[sqlite3.Cursor, tuple], Any]:
+    """Builds (once per type) a row_factory constructing row_type directly"""
+    make = row_type._make
+    return lambda cursor, row: make(row)
+
+# --- Schema ---
+# Idempotent DDL applied at startup on top of the existing tables
+SCHEMA_STATEMENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_orders_cus_time ON Orders(cus_id, order_time DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_bills_emp ON Bills(emp_id)",
+    "CREATE INDEX IF NOT EXISTS idx_deliveries_order ON Deliveries(order_id)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_status_time ON Orders(status, order_time DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_time ON Orders(order_time)",
+    "CREATE INDEX IF NOT EXISTS idx_ingredients_stock ON Ingredients(stock)",
+    "CREATE INDEX IF NOT EXISTS idx_ingredients_expiry ON Ingredients(expiry)",
+    """
+    CREATE TABLE IF NOT EXISTS DishIngredients (
+        dish_id INTEGER NOT NULL,
+        ingre_id INTEGER NOT NULL,
+        qty REAL NOT NULL,
+        PRIMARY KEY (dish_id, ingre_id),
+        FOREIGN KEY (dish_id) REFERENCES Dishes(dish_id),
+        FOREIGN KEY (ingre_id) REFERENCES Ingredients(ingre_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS OrderItems (
+        order_id INTEGER NOT NULL,
+        dish_id INTEGER NOT NULL,
+        qty INTEGER NOT NULL,
+        PRIMARY KEY (order_id, dish_id),
+        FOREIGN KEY (order_id) REFERENCES Orders(order_id),
+        FOREIGN KEY (dish_id) REFERENCES Dishes(dish_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_orderitems_dish ON OrderItems(dish_id)",
+)
+
+# Phone numbers identify customers. Applied on its own by ensure_schema(),
+# because older databases may already hold duplicate phones; those keep a
+# plain index for lookups instead
+Q_DUPLICATE_PHONE = """
+SELECT 1 FROM Customers GROUP BY cus_phone HAVING COUNT(*) > 1 LIMIT 1
+"""
+Q_CREATE_PHONE_UNIQUE = "CREATE UNIQUE INDEX IF NOT EXISTS uq_customers_phone ON Customers(cus_phone)"
+Q_CREATE_PHONE_INDEX = "CREATE INDEX IF NOT EXISTS idx_customers_phone ON Customers(cus_phone)"
+
+# PRAGMA user_version once every migration in ensure_schema() has run
+SCHEMA_VERSION = 1
+
+Q_PING = "SELECT 1"
+
+Q_TABLE_EXISTS = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+
+# Search terms shorter than this fall back to LIKE (trigrams need 3 chars)
+FTS_MIN_TERM = 3
+
+
+def _fts_statements(table: str, key: str, columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Builds an external-content FTS5 table over table plus its sync triggers"""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    delete = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{key}, {old});"
+    insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{key}, {new});"
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='{key}', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} "
+        f"BEGIN {delete} {insert} END",
+    )
+
+
+# Trigram full-text indexes backing the substring searches
+FTS_SCHEMA = {
+    "Customers_fts": _fts_statements("Customers", "cus_id", ("cus_name", "cus_phone")),
+    "Dishes_fts": _fts_statements("Dishes", "dish_id", ("dish_name", "recipe")),
+}
+
+
+def fts_phrase(search_term: str) -> str:
+    """Quotes a search term as a single FTS5 phrase"""
+    return '"' + search_term.replace('"', '""') + '"'
+
+
+@functools.lru_cache(maxsize=None)
+def _with_returning_rowid(query: str) -> str:
+    """Appends RETURNING rowid to an INSERT, built once per statement"""
+    return sys.intern(query.rstrip().rstrip(";") + " RETURNING rowid")
+
+
 # --- Database Connection Manager ---
 class DatabaseManager:
     """Manages database connections and operations"""
     
-    def __init__(self, db_name: str = DATABASE_NAME):
+    def __init__(self, db_name: str = DATABASE_NAME, pool_size: int = POOL_SIZE):
         self.db_name = db_name
+        self.pool = SQLiteConnectionPool(db_name, size=pool_size)
+        self._versions: Dict[str, int] = {}
+        self._versions_lock = threading.Lock()
+        # Called with the table name whenever a table's version is bumped
+        self._listeners: List[Callable[[str], None]] = []
+        self.fts_enabled = False  # set by ensure_schema()
+        atexit.register(self.close)
     
-    @contextmanager
-    def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+    def close(self) -> None:
+        """Closes all pooled connections"""
+        self.pool.close()
+    
+    def ensure_schema(self) -> bool:
+        """
+        Applies SCHEMA_STATEMENTS (indexes etc.) if not already present
+        
+        Data migrations newer than the database's user_version run once in
+        the same transaction. On a database that has never been analyzed, also runs ANALYZE so the
+        planner has statistics for the new indexes from the first query.
+        The customer phone index and full-text search indexes are set up
+        afterwards (see _ensure_phone_index and _ensure_fts).
+        """
+        try:
+            with self.transaction() as conn:
+                for statement in SCHEMA_STATEMENTS:
+                    conn.execute(statement)
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version < 1:
+                    self._backfill_order_items(conn)
+                if version < SCHEMA_VERSION:
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                analyzed = conn.execute(Q_TABLE_EXISTS, ("sqlite_stat1",)).fetchone()
+                if analyzed is None:
+                    conn.execute("ANALYZE")
+                    logger.info("Collected planner statistics")
+        except sqlite3.Error as e:
+            logger.error("Failed to apply schema: %s", e)
+            return False
+        
+        self._ensure_phone_index()
+        self.fts_enabled = self._ensure_fts()
+        return True
+    
+    def _ensure_phone_index(self) -> None:
+        """
+        Indexes Customers(cus_phone), as a unique index when possible
+        
+        Runs in its own transaction so a failure here never rolls back the
+        rest of the schema. Databases that already hold duplicate phones
+        get a plain index; CustomerManager.add still refuses new duplicates.
+        """
+        try:
+            with self.transaction() as conn:
+                if conn.execute(Q_DUPLICATE_PHONE).fetchone() is None:
+                    conn.execute(Q_CREATE_PHONE_UNIQUE)
+                else:
+                    logger.warning("Duplicate customer phones found; phone index is not unique")
+                    conn.execute(Q_CREATE_PHONE_INDEX)
+        except sqlite3.Error as e:
+            logger.error("Failed to index customer phones: %s", e)
+    
+    @staticmethod
+    def _backfill_order_items(conn: sqlite3.Connection) -> None:
+        """Migration 1: fills OrderItems for orders placed before it existed"""
+        orders = conn.execute(Q_ORDERS_WITHOUT_ITEMS).fetchall()
+        dish_names = {name for name, in conn.execute(Q_DISH_NAMES)}
+        conn.executemany(
+            Q_BACKFILL_ORDER_ITEM,
+            (
+                (order_id, qty, name)
+                for order_id, dish_req in orders
+                for name, qty in parse_dish_req(dish_req or "", dish_names)
+            )
+        )
+        logger.info("Backfilled order items for %s orders", len(orders))
+    
+    def _ensure_fts(self) -> bool:
+        """
+        Creates the FTS_SCHEMA search indexes, filling any that are new
+        
+        Returns:
+            False if this SQLite build lacks FTS5 (searches then use LIKE)
+        """
         try:
-            conn = sqlite3.connect(self.db_name)
-            conn.row_factory = sqlite3.Row
-            yield conn
+            with self.transaction() as conn:
+                for name, statements in FTS_SCHEMA.items():
+                    exists = conn.execute(Q_TABLE_EXISTS, (name,)).fetchone()
+                    for statement in statements:
+                        conn.execute(statement)
+                    if exists is None:
+                        conn.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+                        logger.info("Built search index %s", name)
+            return True
         except sqlite3.Error as e:
-            logger.error(f"Database connection error: {e}")
-            if conn:
+            logger.warning("Full-text search unavailable, using LIKE: %s", e)
+            return False
+    
+    def bump_version(self, table: str) -> None:
+        """
+        Marks a table as changed, invalidating results cached against it
+        
+        Subscribers are notified on the calling thread after the counter
+        is updated.
+        """
+        with self._versions_lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+        for listener in self._listeners:
+            try:
+                listener(table)
+            except Exception as e:
+                logger.error("Change listener failed for %s: %s", table, e)
+    
+    def subscribe(self, listener: Callable[[str], None]) -> None:
+        """Registers a callback run with the table name after each change"""
+        self._listeners.append(listener)
+    
+    def version(self, table: str) -> int:
+        """Returns the change counter of a table"""
+        return self._versions.get(table, 0)
+    
+    @contextmanager
+    def get_connection(self):
+        """Context manager borrowing a pooled database connection"""
+        with self.pool.acquire() as conn:
+            try:
+                yield conn
+            except sqlite3.Error as e:
+                logger.error("Database connection error: %s", e)
                 conn.rollback()
-            raise
-        finally:
-            if conn:
-                conn.close()
+                raise
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager grouping several writes into one transaction
+        
+        Commits when the block exits normally, rolls back if it raises.
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.rollback()
+                raise
+            conn.commit()
     
     def execute_query(
         self, 
         query: str, 
         params: Tuple = (), 
         fetch_one: bool = False, 
-        commit: bool = False
+        commit: bool = False,
+        raw: bool = False,
+        row_type: Optional[type] = None,
+        rowcount: bool = False
     ) -> Optional[Any]:
         """
         Executes a query with proper error handling
@@ -102,32 +360,131 @@ class DatabaseManager:
             params: Query parameters
             fetch_one: Whether to fetch single result
             commit: Whether to commit changes
+            raw: Return plain tuples instead of sqlite3.Row objects
+            row_type: namedtuple class to build each row as instead
+            rowcount: With commit, return the number of affected rows
             
         Returns:
-            Query results or success status
+            Query results or success status; with both commit and fetch_one
+            the first row of a RETURNING clause (or None)
         """
+        # Hot path: borrow from the pool directly rather than through the
+        # get_connection()/acquire() generator context managers
+        pool = self.pool
         try:
-            with self.get_connection() as conn:
-                cur = conn.cursor()
-                cur.execute(query, params)
+            conn = pool.get()
+        except sqlite3.Error as e:
+            logger.error("Database error executing query: %s", e)
+            return None
+        
+        try:
+            cur = conn.execute(query, params)
+            if raw:
+                cur.row_factory = None
+            elif row_type is not None:
+                cur.row_factory = _row_factory(row_type)
+            
+            if commit:
+                # Drain RETURNING rows so the write completes before commit
+                rows = cur.fetchall()
+                conn.commit()
+                if fetch_one:
+                    return rows[0] if rows else None
+                return cur.rowcount if rowcount else True
+            elif fetch_one:
+                return cur.fetchone()
+            else:
+                return cur.fetchall()
                 
-                if commit:
-                    conn.commit()
-                    return True
-                elif fetch_one:
-                    return cur.fetchone()
-                else:
-                    return cur.fetchall()
-                    
         except sqlite3.IntegrityError as e:
-            logger.error(f"Integrity constraint violation: {e}")
+            logger.error("Integrity constraint violation: %s", e)
             return None
         except sqlite3.Error as e:
-            logger.error(f"Database error executing query: {e}")
+            logger.error("Database error executing query: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
+            logger.error("Unexpected error: %s", e)
             return None
+        finally:
+            pool.put(conn)
+    
+    def execute_iter(
+        self,
+        query: str,
+        params: Tuple = (),
+        chunk: int = ITER_ARRAYSIZE,
+        row_type: Optional[type] = None
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Streams query results instead of materializing them with fetchall
+        
+        The pooled connection stays borrowed until the iterator is
+        exhausted or closed.
+        
+        Args:
+            query: SQL query string
+            params: Query parameters
+            chunk: Rows fetched from SQLite per step
+            row_type: namedtuple class to build each row as instead
+            
+        Yields:
+            Result rows, fetched chunk at a time
+        """
+        try:
+            with self.get_connection() as conn:
+                cur = conn.cursor()
+                cur.arraysize = chunk
+                if row_type is not None:
+                    cur.row_factory = _row_factory(row_type)
+                try:
+                    cur.execute(query, params)
+                    while True:
+                        rows = cur.fetchmany()
+                        if not rows:
+                            break
+                        yield from rows
+                finally:
+                    cur.close()
+        except sqlite3.Error as e:
+            logger.error("Database error streaming query: %s", e)
+    
+    def fetch_by_ids(
+        self, query: str, key: str, ids: Iterable[int]
+    ) -> Dict[int, sqlite3.Row]:
+        """
+        Looks up many rows by ID with one IN (...) query per chunk of IDs
+        
+        Args:
+            query: SELECT whose "{}" receives the IN placeholders
+            key: ID column the result is keyed on
+            ids: IDs to fetch; duplicates are looked up once
+            
+        Returns:
+            Mapping of ID to row; IDs that do not exist are left out
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found: Dict[int, sqlite3.Row] = {}
+        for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+            chunk = tuple(unique_ids[start:start + IN_CHUNK_SIZE])
+            sql = query.format(",".join("?" * len(chunk)))
+            for row in self.execute_query(sql, chunk) or []:
+                found[row[key]] = row
+        return found
+    
+    @staticmethod
+    def insert_returning_id(
+        conn: sqlite3.Connection, query: str, params: Tuple = ()
+    ) -> int:
+        """
+        Runs an INSERT on conn and returns the new row's ID
+        
+        Uses a RETURNING rowid clause when SQLite supports it so the ID comes
+        back from the insert itself, falling back to lastrowid otherwise.
+        """
+        if not HAS_RETURNING:
+            return conn.execute(query, params).lastrowid
+        rows = conn.execute(_with_returning_rowid(query), params).fetchall()
+        return rows[0][0]
     
     def execute_with_lastrowid(self, query: str, params: Tuple = ()) -> Optional[int]:
         """
@@ -142,24 +499,433 @@ class DatabaseManager:
         """
         try:
             with self.get_connection() as conn:
-                cur = conn.cursor()
-                cur.execute(query, params)
-                last_id = cur.lastrowid
+                last_id = self.insert_returning_id(conn, query, params)
                 conn.commit()
-                logger.info(f"Successfully inserted record with ID: {last_id}")
+                logger.info("Successfully inserted record with ID: %s", last_id)
                 return last_id
         except sqlite3.Error as e:
-            logger.error(f"Error inserting record: {e}")
+            logger.error("Error inserting record: %s", e)
+            return None
+    
+    def execute_many(self, query: str, seq_of_params: Iterable[Tuple]) -> Optional[int]:
+        """
+        Executes a statement once per parameter tuple inside one transaction
+        
+        Args:
+            query: SQL statement
+            seq_of_params: Iterable of parameter tuples
+            
+        Returns:
+            Number of affected rows or None on failure (nothing is written)
+        """
+        try:
+            with self.transaction() as conn:
+                cur = conn.cursor()
+                cur.executemany(query, seq_of_params)
+                logger.info("Batch affected %s rows", cur.rowcount)
+                return cur.rowcount
+        except sqlite3.Error as e:
+            logger.error("Error executing batch: %s", e)
             return None
 
+# --- SQL Statements ---
+# Module-level so every call passes the same string object to the
+# sqlite3 statement cache.
+
+# Customers
+# Inserts nothing when the phone is already taken; works whether or not
+# the phone index is unique
+Q_INSERT_CUSTOMER = """
+INSERT INTO Customers (cus_name, cus_phone)
+SELECT ?1, ?2
+WHERE NOT EXISTS (SELECT 1 FROM Customers WHERE cus_phone = ?2)
+"""
+
+Q_CUSTOMER_BY_PHONE = "SELECT cus_id, cus_name, cus_phone FROM Customers WHERE cus_phone = ?"
+
+Q_UPDATE_CUSTOMER = "UPDATE Customers SET cus_name = ?, cus_phone = ? WHERE cus_id = ?"
+
+Q_SEARCH_CUSTOMERS = """
+SELECT cus_id, cus_name, cus_phone
+FROM Customers
+WHERE cus_name LIKE ? OR cus_phone LIKE ?
+ORDER BY cus_name
+"""
+
+Q_SEARCH_CUSTOMERS_FTS = """
+SELECT c.cus_id, c.cus_name, c.cus_phone
+FROM Customers_fts
+JOIN Customers c ON c.cus_id = Customers_fts.rowid
+WHERE Customers_fts MATCH ?
+ORDER BY c.cus_name
+"""
+
+
+# Employees
+Q_INSERT_EMPLOYEE = "INSERT INTO Employees (emp_name) VALUES (?)"
+
+Q_UPDATE_EMPLOYEE = "UPDATE Employees SET emp_name = ? WHERE emp_id = ?"
+
+Q_EMPLOYEE_ORDER_STATS = """
+SELECT
+    e.emp_id,
+    e.emp_name,
+    COUNT(b.bill_id) AS orders_served,
+    COALESCE(SUM(b.total_amount), 0) AS total_sales
+FROM
+    Employees e
+LEFT JOIN
+    Bills b ON e.emp_id = b.emp_id
+GROUP BY
+    e.emp_id, e.emp_name
+ORDER BY
+    orders_served DESC, total_sales DESC
+"""
+
+
+# Dishes
+Q_INSERT_DISH = """
+INSERT INTO Dishes (dish_name, recipe, cooking_time, dish_price)
+VALUES (?, ?, ?, ?)
+"""
+
+Q_UPDATE_DISH = """
+UPDATE Dishes
+SET dish_name = ?, recipe = ?, cooking_time = ?, dish_price = ?
+WHERE dish_id = ?
+"""
+
+Q_SEARCH_DISHES = """
+SELECT dish_id, dish_name, recipe, cooking_time, dish_price
+FROM Dishes
+WHERE dish_name LIKE ? OR recipe LIKE ?
+ORDER BY dish_name
+"""
+
+Q_SEARCH_DISHES_FTS = """
+SELECT d.dish_id, d.dish_name, d.recipe, d.cooking_time, d.dish_price
+FROM Dishes_fts
+JOIN Dishes d ON d.dish_id = Dishes_fts.rowid
+WHERE Dishes_fts MATCH ?
+ORDER BY d.dish_name
+"""
+
+Q_POPULAR_DISHES = """
+SELECT
+    d.dish_id, d.dish_name, d.dish_price,
+    COUNT(*) as order_count,
+    SUM(oi.qty) as total_qty,
+    SUM(oi.qty * d.dish_price) as total_sales
+FROM OrderItems oi
+JOIN Dishes d ON d.dish_id = oi.dish_id
+GROUP BY d.dish_id, d.dish_name, d.dish_price
+ORDER BY order_count DESC
+LIMIT ?
+"""
+
+
+# Ingredients
+Q_INSERT_INGREDIENT = """
+INSERT INTO Ingredients (ingre_name, stock, unit, expiry, suppliers)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+Q_UPDATE_STOCK = "UPDATE Ingredients SET stock = ? WHERE ingre_id = ?"
+
+Q_UPDATE_INGREDIENT = """
+UPDATE Ingredients
+SET ingre_name = ?, stock = ?, unit = ?, expiry = ?, suppliers = ?
+WHERE ingre_id = ?
+"""
+
+Q_LOW_STOCK = """
+SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers
+FROM Ingredients
+WHERE stock < ?
+ORDER BY stock ASC
+"""
+
+Q_EXPIRED_INGREDIENTS = """
+SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers
+FROM Ingredients
+WHERE expiry < ?
+ORDER BY expiry ASC
+"""
+
+Q_SET_DISH_INGREDIENT = """
+INSERT OR REPLACE INTO DishIngredients (dish_id, ingre_id, qty)
+VALUES (?, ?, ?)
+"""
+
+# Per-connection scratch table holding the dishes of the order being deducted
+Q_CREATE_ORDER_REQ = """
+CREATE TEMP TABLE IF NOT EXISTS order_req (dish_id INTEGER, count INTEGER)
+"""
+
+Q_INSERT_ORDER_REQ = "INSERT INTO temp.order_req (dish_id, count) VALUES (?, ?)"
+
+Q_CLEAR_ORDER_REQ = "DELETE FROM temp.order_req"
+
+# First ingredient the order needs more of than is in stock, if any
+Q_STOCK_SHORTAGE = """
+SELECT i.ingre_id, i.stock, need.amount
+FROM (
+    SELECT di.ingre_id, SUM(di.qty * oq.count) AS amount
+    FROM DishIngredients di
+    JOIN temp.order_req oq ON di.dish_id = oq.dish_id
+    GROUP BY di.ingre_id
+) need
+JOIN Ingredients i ON i.ingre_id = need.ingre_id
+WHERE i.stock < need.amount
+LIMIT 1
+"""
+
+Q_DEDUCT_STOCK = """
+UPDATE Ingredients
+SET stock = stock - (
+    SELECT SUM(di.qty * oq.count)
+    FROM DishIngredients di
+    JOIN temp.order_req oq ON di.dish_id = oq.dish_id
+    WHERE di.ingre_id = Ingredients.ingre_id
+)
+WHERE ingre_id IN (
+    SELECT di.ingre_id
+    FROM DishIngredients di
+    JOIN temp.order_req oq ON di.dish_id = oq.dish_id
+)
+"""
+
+# Orders
+# Timestamps are stamped by SQLite as local "YYYY-MM-DD HH:MM:SS"
+Q_INSERT_ORDER = """
+INSERT INTO Orders (dish_req, total_price, order_time, status, cus_id)
+VALUES (?, ?, datetime('now', 'localtime'), ?, ?)
+"""
+
+# Repeats of a dish within one order add up
+Q_INSERT_ORDER_ITEM = """
+INSERT INTO OrderItems (order_id, dish_id, qty) VALUES (?, ?, ?)
+ON CONFLICT (order_id, dish_id) DO UPDATE SET qty = qty + excluded.qty
+"""
+
+# Migration 1 only has the dish_req text, so dish names are resolved here.
+# Unknown names are skipped; a name shared by several dishes goes to the
+# oldest of them
+Q_BACKFILL_ORDER_ITEM = """
+INSERT INTO OrderItems (order_id, dish_id, qty)
+SELECT ?, MIN(dish_id), ? FROM Dishes WHERE dish_name = ?
+GROUP BY dish_name
+ON CONFLICT (order_id, dish_id) DO UPDATE SET qty = qty + excluded.qty
+"""
+
+Q_DISH_NAMES = "SELECT DISTINCT dish_name FROM Dishes"
+
+Q_ORDERS_WITHOUT_ITEMS = """
+SELECT o.order_id, o.dish_req
+FROM Orders o
+WHERE NOT EXISTS (SELECT 1 FROM OrderItems oi WHERE oi.order_id = o.order_id)
+"""
+
+Q_INSERT_BILL = """
+INSERT INTO Bills (order_id, emp_id, shipper_id, total_amount, bill_time)
+VALUES (?, ?, ?, ?, datetime('now', 'localtime'))
+"""
+
+Q_INSERT_DELIVERY = """
+INSERT INTO Deliveries (order_id, shipper_id, delivery_time, delivery_addr, distance, fee)
+VALUES (?, ?, datetime('now', 'localtime'), ?, ?, ?)
+"""
+
+Q_ALL_ORDER_DETAILS = """
+SELECT
+    o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
+    c.cus_name, c.cus_phone
+FROM
+    Orders o
+JOIN
+    Customers c ON o.cus_id = c.cus_id
+ORDER BY
+    o.order_time DESC
+"""
+
+Q_RECENT_ORDER_DETAILS = Q_ALL_ORDER_DETAILS.rstrip() + "\nLIMIT ?\n"
+
+Q_ORDER_BY_ID = """
+SELECT
+    o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
+    c.cus_id, c.cus_name, c.cus_phone
+FROM
+    Orders o
+JOIN
+    Customers c ON o.cus_id = c.cus_id
+WHERE
+    o.order_id = ?
+"""
+
+Q_UPDATE_ORDER_STATUS = "UPDATE Orders SET status = ? WHERE order_id = ?"
+
+Q_DELIVERY_INFO = """
+SELECT
+    d.delivery_addr, d.distance, d.fee, d.delivery_time,
+    s.shipper_info
+FROM
+    Deliveries d
+JOIN
+    Shippers s ON d.shipper_id = s.shipper_id
+WHERE
+    d.order_id = ?
+"""
+
+Q_ORDERS_BY_STATUS = """
+SELECT
+    o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
+    c.cus_name, c.cus_phone
+FROM
+    Orders o
+JOIN
+    Customers c ON o.cus_id = c.cus_id
+WHERE
+    o.status = ?
+ORDER BY
+    o.order_time DESC
+"""
+
+Q_REVENUE_REPORT = """
+SELECT
+    COUNT(*) as total_orders,
+    SUM(total_price) as total_revenue,
+    AVG(total_price) as avg_order_value
+FROM Orders
+WHERE order_time >= ? AND order_time < datetime(?, '+1 day')
+"""
+
+Q_ORDER_STATS = """
+SELECT COUNT(*), COALESCE(SUM(total_price), 0) FROM Orders
+"""
+
+# Interned so cache lookups on equal SQL compare by identity
+for _name, _sql in list(globals().items()):
+    if _name.startswith("Q_"):
+        globals()[_name] = sys.intern(_sql)
+del _name, _sql
+
+
+# --- Order Parsing ---
+# dish_req items look like "Pizza (x2)"; a bare name means one portion
+_DISH_REQ_ITEM = re.compile(r"^(.*?)\s*(?:\(x(\d+)\))?$")
+
+
+def parse_dish_req(
+    dish_req_string: str, dish_names: Optional[Collection[str]] = None
+) -> List[Tuple[str, int]]:
+    """
+    Splits an order's dish_req string into (dish_name, count) pairs
+    
+    With dish_names, pieces split at a comma are joined back together
+    when that gives a known dish, so names containing commas survive.
+    
+    Example:
+        "Burger gà (x1), Pizza (x5)" -> [("Burger gà", 1), ("Pizza", 5)]
+    """
+    parts = dish_req_string.split(",")
+    items = []
+    i = 0
+    while i < len(parts):
+        # Longest run of pieces naming a known dish, else the single piece
+        end = i + 1
+        if dish_names:
+            for j in range(len(parts), i + 1, -1):
+                name = _DISH_REQ_ITEM.match(",".join(parts[i:j]).strip()).group(1)
+                if name in dish_names:
+                    end = j
+                    break
+        name, count = _DISH_REQ_ITEM.match(",".join(parts[i:end]).strip()).groups()
+        if name:
+            items.append((name, int(count) if count else 1))
+        i = end
+    return items
+
+
 # --- Manager Classes ---
 
-class CustomerManager:
-    """Handles all customer-related operations"""
+class TableManager:
+    """
+    Base class providing the read and delete methods every table shares
+    
+    Subclasses declare their table (TABLE, PK, ROW_TYPE, ORDER_BY, NOUN);
+    __init_subclass__ builds the SQL for get_all/iter_all, get_by_id,
+    get_many_by_ids and delete once per class, so all instances reuse the
+    same interned statements.
+    """
+    TABLE: str
+    PK: str
+    ROW_TYPE: type  # namedtuple of the selected columns, primary key first
+    ORDER_BY: str
+    NOUN: str  # used in log messages
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        select = f"SELECT {', '.join(cls.ROW_TYPE._fields)} FROM {cls.TABLE}"
+        cls._q_all = sys.intern(f"{select} ORDER BY {cls.ORDER_BY}")
+        cls._q_by_id = sys.intern(f"{select} WHERE {cls.PK} = ?")
+        cls._q_by_ids = f"{select} WHERE {cls.PK} IN ({{}})"
+        cls._q_delete = sys.intern(f"DELETE FROM {cls.TABLE} WHERE {cls.PK} = ?")
+        cls._q_count = sys.intern(f"SELECT COUNT(*) FROM {cls.TABLE}")
     
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
     
+    def _after_write(self) -> None:
+        """Called after every successful write; bumps the table's version"""
+        self.db.bump_version(self.TABLE)
+    
+    def get_all(self, typed: bool = False) -> List[sqlite3.Row]:
+        """Retrieves all rows (as ROW_TYPE tuples when typed)"""
+        row_type = self.ROW_TYPE if typed else None
+        return self.db.execute_query(self._q_all, row_type=row_type) or []
+    
+    def iter_all(self, typed: bool = False) -> Iterator[sqlite3.Row]:
+        """Streams all rows in the same order as get_all()"""
+        row_type = self.ROW_TYPE if typed else None
+        return self.db.execute_iter(self._q_all, row_type=row_type)
+    
+    def count(self) -> int:
+        """Counts the table's rows without fetching them"""
+        result = self.db.execute_query(self._q_count, fetch_one=True, raw=True)
+        return result[0] if result else 0
+    
+    def get_by_id(self, row_id: int) -> Optional[sqlite3.Row]:
+        """Finds a row by primary key"""
+        return self.db.execute_query(self._q_by_id, (row_id,), fetch_one=True)
+    
+    def get_many_by_ids(self, row_ids: Iterable[int]) -> Dict[int, sqlite3.Row]:
+        """Finds rows by primary key with batched IN queries, keyed by ID"""
+        return self.db.fetch_by_ids(self._q_by_ids, self.PK, row_ids)
+    
+    def delete(self, row_id: int) -> bool:
+        """Deletes a row by primary key"""
+        result = self.db.execute_query(self._q_delete, (row_id,), commit=True)
+        if result:
+            self._after_write()
+            logger.info("Deleted %s ID %s", self.NOUN, row_id)
+        return bool(result)
+
+
+class CustomerManager(TableManager):
+    """Handles all customer-related operations"""
+    TABLE = "Customers"
+    PK = "cus_id"
+    ROW_TYPE = CustomerRow
+    ORDER_BY = "cus_name"
+    NOUN = "customer"
+    
+    def __init__(self, db_manager: DatabaseManager):
+        super().__init__(db_manager)
+        # Phone lookups are memoized; every customer write clears the cache
+        self._get_by_phone_cached = functools.lru_cache(maxsize=1024)(
+            self._fetch_by_phone
+        )
+    
     def add(self, name: str, phone: str) -> bool:
         """
         Adds a new customer
@@ -175,68 +941,79 @@ class CustomerManager:
             logger.warning("Customer name and phone are required")
             return False
         
-        # Check if customer already exists
-        if self.get_by_phone(phone):
-            logger.warning(f"Customer with phone {phone} already exists")
+        # A phone that already exists inserts nothing (rowcount 0)
+        added = self.db.execute_query(
+            Q_INSERT_CUSTOMER, (name, phone), commit=True, rowcount=True
+        )
+        if added is None:
+            return False
+        if not added:
+            logger.warning("Customer with phone %s already exists", phone)
             return False
         
-        query = "INSERT INTO Customers (cus_name, cus_phone) VALUES (?, ?)"
-        result = self.db.execute_query(query, (name, phone), commit=True)
+        self._after_write()
+        logger.info("Added customer: %s (%s)", name, phone)
+        return True
+    
+    def add_many(self, rows: Iterable[Tuple[str, str]]) -> int:
+        """
+        Adds customers in a single transaction
         
-        if result:
-            logger.info(f"Added customer: {name} ({phone})")
-        return bool(result)
+        Rows whose phone number already exists are skipped.
+        
+        Args:
+            rows: (name, phone) tuples
+            
+        Returns:
+            Number of customers added (0 on failure)
+        """
+        added = self.db.execute_many(Q_INSERT_CUSTOMER, rows) or 0
+        if added:
+            self._after_write()
+        return added
     
-    def get_all(self) -> List[sqlite3.Row]:
-        """Retrieves all customers"""
-        query = "SELECT cus_id, cus_name, cus_phone FROM Customers ORDER BY cus_name"
-        return self.db.execute_query(query) or []
+    def _after_write(self) -> None:
+        self._get_by_phone_cached.cache_clear()
+        super()._after_write()
     
     def get_by_phone(self, phone: str) -> Optional[sqlite3.Row]:
         """Finds customer by phone number"""
-        query = "SELECT cus_id, cus_name, cus_phone FROM Customers WHERE cus_phone = ?"
-        return self.db.execute_query(query, (phone,), fetch_one=True)
+        return self._get_by_phone_cached(phone)
     
-    def get_by_id(self, cus_id: int) -> Optional[sqlite3.Row]:
-        """Finds customer by ID"""
-        query = "SELECT cus_id, cus_name, cus_phone FROM Customers WHERE cus_id = ?"
-        return self.db.execute_query(query, (cus_id,), fetch_one=True)
+    def _fetch_by_phone(self, phone: str) -> Optional[sqlite3.Row]:
+        """Uncached phone lookup backing get_by_phone"""
+        return self.db.execute_query(Q_CUSTOMER_BY_PHONE, (phone,), fetch_one=True)
     
     def update(self, cus_id: int, name: str, phone: str) -> bool:
         """Updates customer information"""
-        query = "UPDATE Customers SET cus_name = ?, cus_phone = ? WHERE cus_id = ?"
-        result = self.db.execute_query(query, (name, phone, cus_id), commit=True)
-        
-        if result:
-            logger.info(f"Updated customer ID {cus_id}")
-        return bool(result)
-    
-    def delete(self, cus_id: int) -> bool:
-        """Deletes a customer"""
-        query = "DELETE FROM Customers WHERE cus_id = ?"
-        result = self.db.execute_query(query, (cus_id,), commit=True)
-        
+        result = self.db.execute_query(Q_UPDATE_CUSTOMER, (name, phone, cus_id), commit=True)
         if result:
-            logger.info(f"Deleted customer ID {cus_id}")
+            self._after_write()
+            logger.info("Updated customer ID %s", cus_id)
         return bool(result)
     
     def search(self, search_term: str) -> List[sqlite3.Row]:
         """Searches customers by name or phone"""
-        query = """
-        SELECT cus_id, cus_name, cus_phone 
-        FROM Customers 
-        WHERE cus_name LIKE ? OR cus_phone LIKE ?
-        ORDER BY cus_name
-        """
+        if self.db.fts_enabled and len(search_term) >= FTS_MIN_TERM:
+            return self.db.execute_query(
+                Q_SEARCH_CUSTOMERS_FTS, (fts_phrase(search_term),)
+            ) or []
         pattern = f"%{search_term}%"
-        return self.db.execute_query(query, (pattern, pattern)) or []
+        return self.db.execute_query(Q_SEARCH_CUSTOMERS, (pattern, pattern)) or []
 
 
-class EmployeeManager:
+class EmployeeManager(TableManager):
     """Handles all employee-related operations"""
+    TABLE = "Employees"
+    PK = "emp_id"
+    ROW_TYPE = EmployeeRow
+    ORDER_BY = "emp_name"
+    NOUN = "employee"
     
     def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
+        super().__init__(db_manager)
+        # (Bills version, Employees version) the cached stats were read at
+        self._stats_cache: Optional[Tuple[Tuple[int, int], List[sqlite3.Row]]] = None
     
     def add(self, name: str) -> bool:
         """Adds a new employee"""
@@ -244,66 +1021,59 @@ class EmployeeManager:
             logger.warning("Employee name is required")
             return False
         
-        query = "INSERT INTO Employees (emp_name) VALUES (?)"
-        result = self.db.execute_query(query, (name,), commit=True)
-        
+        result = self.db.execute_query(Q_INSERT_EMPLOYEE, (name,), commit=True)
         if result:
-            logger.info(f"Added employee: {name}")
+            self._after_write()
+            logger.info("Added employee: %s", name)
         return bool(result)
     
-    def get_all(self) -> List[sqlite3.Row]:
-        """Retrieves all employees"""
-        query = "SELECT emp_id, emp_name FROM Employees ORDER BY emp_name"
-        return self.db.execute_query(query) or []
-    
-    def get_by_id(self, emp_id: int) -> Optional[sqlite3.Row]:
-        """Finds employee by ID"""
-        query = "SELECT emp_id, emp_name FROM Employees WHERE emp_id = ?"
-        return self.db.execute_query(query, (emp_id,), fetch_one=True)
+    def add_many(self, rows: Iterable[Tuple[str]]) -> int:
+        """
+        Adds employees in a single transaction
+        
+        Args:
+            rows: (name,) tuples
+            
+        Returns:
+            Number of employees added (0 on failure)
+        """
+        added = self.db.execute_many(Q_INSERT_EMPLOYEE, rows) or 0
+        if added:
+            self._after_write()
+        return added
     
     def update(self, emp_id: int, name: str) -> bool:
         """Updates employee information"""
-        query = "UPDATE Employees SET emp_name = ? WHERE emp_id = ?"
-        result = self.db.execute_query(query, (name, emp_id), commit=True)
-        
-        if result:
-            logger.info(f"Updated employee ID {emp_id}")
-        return bool(result)
-    
-    def delete(self, emp_id: int) -> bool:
-        """Deletes an employee"""
-        query = "DELETE FROM Employees WHERE emp_id = ?"
-        result = self.db.execute_query(query, (emp_id,), commit=True)
-        
+        result = self.db.execute_query(Q_UPDATE_EMPLOYEE, (name, emp_id), commit=True)
         if result:
-            logger.info(f"Deleted employee ID {emp_id}")
+            self._after_write()
+            logger.info("Updated employee ID %s", emp_id)
         return bool(result)
     
     def get_order_stats(self) -> List[sqlite3.Row]:
-        """Retrieves employee performance statistics"""
-        query = """
-        SELECT 
-            e.emp_id, 
-            e.emp_name, 
-            COUNT(b.bill_id) AS orders_served,
-            COALESCE(SUM(b.total_amount), 0) AS total_sales
-        FROM 
-            Employees e
-        LEFT JOIN 
-            Bills b ON e.emp_id = b.emp_id
-        GROUP BY 
-            e.emp_id, e.emp_name
-        ORDER BY 
-            orders_served DESC, total_sales DESC
-        """
-        return self.db.execute_query(query) or []
-
-
-class DishManager:
+        """
+        Retrieves employee performance statistics
+        
+        The result is reused until a bill or employee is written.
+        """
+        key = (self.db.version("Bills"), self.db.version("Employees"))
+        if self._stats_cache and self._stats_cache[0] == key:
+            return self._stats_cache[1]
+        
+        rows = self.db.execute_query(Q_EMPLOYEE_ORDER_STATS)
+        if rows is None:
+            return []
+        self._stats_cache = (key, rows)
+        return rows
+
+
+class DishManager(TableManager):
     """Handles all dish-related operations"""
-    
-    def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
+    TABLE = "Dishes"
+    PK = "dish_id"
+    ROW_TYPE = DishRow
+    ORDER_BY = "dish_name"
+    NOUN = "dish"
     
     def add(self, name: str, recipe: str, cooking_time: int, price: float) -> bool:
         """Adds a new dish"""
@@ -311,93 +1081,67 @@ class DishManager:
             logger.warning("Invalid dish data")
             return False
         
-        query = """
-        INSERT INTO Dishes (dish_name, recipe, cooking_time, dish_price) 
-        VALUES (?, ?, ?, ?)
-        """
         result = self.db.execute_query(
-            query, (name, recipe, cooking_time, price), commit=True
+            Q_INSERT_DISH, (name, recipe, cooking_time, price), commit=True
         )
-        
         if result:
-            logger.info(f"Added dish: {name} (${price})")
+            self._after_write()
+            logger.info("Added dish: %s ($%s)", name, price)
         return bool(result)
     
-    def get_all(self) -> List[sqlite3.Row]:
-        """Retrieves all dishes"""
-        query = """
-        SELECT dish_id, dish_name, recipe, cooking_time, dish_price 
-        FROM Dishes 
-        ORDER BY dish_name
+    def add_many(self, rows: Iterable[Tuple[str, str, int, float]]) -> int:
         """
-        return self.db.execute_query(query) or []
-    
-    def get_by_id(self, dish_id: int) -> Optional[sqlite3.Row]:
-        """Finds dish by ID"""
-        query = """
-        SELECT dish_id, dish_name, recipe, cooking_time, dish_price 
-        FROM Dishes 
-        WHERE dish_id = ?
+        Adds dishes in a single transaction
+        
+        Args:
+            rows: (name, recipe, cooking_time, price) tuples
+            
+        Returns:
+            Number of dishes added (0 on failure)
         """
-        return self.db.execute_query(query, (dish_id,), fetch_one=True)
+        added = self.db.execute_many(Q_INSERT_DISH, rows) or 0
+        if added:
+            self._after_write()
+        return added
     
     def update(
         self, dish_id: int, name: str, recipe: str, cooking_time: int, price: float
     ) -> bool:
         """Updates dish information"""
-        query = """
-        UPDATE Dishes 
-        SET dish_name = ?, recipe = ?, cooking_time = ?, dish_price = ? 
-        WHERE dish_id = ?
-        """
         result = self.db.execute_query(
-            query, (name, recipe, cooking_time, price, dish_id), commit=True
+            Q_UPDATE_DISH, (name, recipe, cooking_time, price, dish_id), commit=True
         )
-        
         if result:
-            logger.info(f"Updated dish ID {dish_id}")
-        return bool(result)
-    
-    def delete(self, dish_id: int) -> bool:
-        """Deletes a dish"""
-        query = "DELETE FROM Dishes WHERE dish_id = ?"
-        result = self.db.execute_query(query, (dish_id,), commit=True)
-        
-        if result:
-            logger.info(f"Deleted dish ID {dish_id}")
+            self._after_write()
+            logger.info("Updated dish ID %s", dish_id)
         return bool(result)
     
     def search(self, search_term: str) -> List[sqlite3.Row]:
-        """Searches dishes by name"""
-        query = """
-        SELECT dish_id, dish_name, recipe, cooking_time, dish_price 
-        FROM Dishes 
-        WHERE dish_name LIKE ? OR recipe LIKE ?
-        ORDER BY dish_name
-        """
+        """Searches dishes by name or recipe"""
+        if self.db.fts_enabled and len(search_term) >= FTS_MIN_TERM:
+            return self.db.execute_query(
+                Q_SEARCH_DISHES_FTS, (fts_phrase(search_term),)
+            ) or []
         pattern = f"%{search_term}%"
-        return self.db.execute_query(query, (pattern, pattern)) or []
+        return self.db.execute_query(Q_SEARCH_DISHES, (pattern, pattern)) or []
     
     def get_popular_dishes(self, limit: int = 10) -> List[sqlite3.Row]:
-        """Gets most ordered dishes"""
-        query = """
-        SELECT 
-            d.dish_id, d.dish_name, d.dish_price,
-            COUNT(*) as order_count
-        FROM Dishes d
-        JOIN Orders o ON o.dish_req LIKE '%' || d.dish_name || '%'
-        GROUP BY d.dish_id, d.dish_name, d.dish_price
-        ORDER BY order_count DESC
-        LIMIT ?
         """
-        return self.db.execute_query(query, (limit,)) or []
+        Gets most ordered dishes
+        
+        Portions sold and sales per dish are summed in SQL alongside the
+        order count, so callers do not need to total them up row by row.
+        """
+        return self.db.execute_query(Q_POPULAR_DISHES, (limit,)) or []
 
 
-class IngredientManager:
+class IngredientManager(TableManager):
     """Handles all ingredient-related operations"""
-    
-    def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
+    TABLE = "Ingredients"
+    PK = "ingre_id"
+    ROW_TYPE = IngredientRow
+    ORDER_BY = "ingre_name"
+    NOUN = "ingredient"
     
     def add(
         self, name: str, stock: float, unit: str, expiry: str, suppliers: str
@@ -407,112 +1151,132 @@ class IngredientManager:
             logger.warning("Invalid ingredient data")
             return False
         
-        query = """
-        INSERT INTO Ingredients (ingre_name, stock, unit, expiry, suppliers) 
-        VALUES (?, ?, ?, ?, ?)
-        """
         result = self.db.execute_query(
-            query, (name, stock, unit, expiry, suppliers), commit=True
+            Q_INSERT_INGREDIENT, (name, stock, unit, expiry, suppliers), commit=True
         )
-        
         if result:
-            logger.info(f"Added ingredient: {name} ({stock} {unit})")
+            self._after_write()
+            logger.info("Added ingredient: %s (%s %s)", name, stock, unit)
         return bool(result)
     
-    def get_all(self) -> List[sqlite3.Row]:
-        """Retrieves all ingredients"""
-        query = """
-        SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers 
-        FROM Ingredients 
-        ORDER BY ingre_name
+    def add_many(self, rows: Iterable[Tuple[str, float, str, str, str]]) -> int:
         """
-        return self.db.execute_query(query) or []
-    
-    def get_by_id(self, ingre_id: int) -> Optional[sqlite3.Row]:
-        """Finds ingredient by ID"""
-        query = """
-        SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers 
-        FROM Ingredients 
-        WHERE ingre_id = ?
+        Adds ingredients in a single transaction
+        
+        Args:
+            rows: (name, stock, unit, expiry, suppliers) tuples
+            
+        Returns:
+            Number of ingredients added (0 on failure)
         """
-        return self.db.execute_query(query, (ingre_id,), fetch_one=True)
+        added = self.db.execute_many(Q_INSERT_INGREDIENT, rows) or 0
+        if added:
+            self._after_write()
+        return added
     
     def update_stock(self, ingre_id: int, new_stock: float) -> bool:
         """Updates ingredient stock level"""
         if new_stock < 0:
-            logger.warning(f"Invalid stock level: {new_stock}")
+            logger.warning("Invalid stock level: %s", new_stock)
             return False
         
-        query = "UPDATE Ingredients SET stock = ? WHERE ingre_id = ?"
-        result = self.db.execute_query(query, (new_stock, ingre_id), commit=True)
-        
+        result = self.db.execute_query(Q_UPDATE_STOCK, (new_stock, ingre_id), commit=True)
         if result:
-            logger.info(f"Updated stock for ingredient ID {ingre_id} to {new_stock}")
+            self._after_write()
+            logger.info("Updated stock for ingredient ID %s to %s", ingre_id, new_stock)
         return bool(result)
     
     def update(
         self, ingre_id: int, name: str, stock: float, unit: str, expiry: str, suppliers: str
     ) -> bool:
         """Updates ingredient information"""
-        query = """
-        UPDATE Ingredients 
-        SET ingre_name = ?, stock = ?, unit = ?, expiry = ?, suppliers = ? 
-        WHERE ingre_id = ?
-        """
         result = self.db.execute_query(
-            query, (name, stock, unit, expiry, suppliers, ingre_id), commit=True
+            Q_UPDATE_INGREDIENT, (name, stock, unit, expiry, suppliers, ingre_id), commit=True
         )
-        
-        if result:
-            logger.info(f"Updated ingredient ID {ingre_id}")
-        return bool(result)
-    
-    def delete(self, ingre_id: int) -> bool:
-        """Deletes an ingredient"""
-        query = "DELETE FROM Ingredients WHERE ingre_id = ?"
-        result = self.db.execute_query(query, (ingre_id,), commit=True)
-        
         if result:
-            logger.info(f"Deleted ingredient ID {ingre_id}")
+            self._after_write()
+            logger.info("Updated ingredient ID %s", ingre_id)
         return bool(result)
     
     def get_low_stock(self, threshold: float = 10.0) -> List[sqlite3.Row]:
         """Gets ingredients with low stock"""
-        query = """
-        SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers 
-        FROM Ingredients 
-        WHERE stock < ?
-        ORDER BY stock ASC
-        """
-        return self.db.execute_query(query, (threshold,)) or []
+        return self.db.execute_query(Q_LOW_STOCK, (threshold,)) or []
     
     def get_expired(self) -> List[sqlite3.Row]:
         """Gets expired ingredients"""
-        today = datetime.date.today().isoformat()
-        query = """
-        SELECT ingre_id, ingre_name, stock, unit, expiry, suppliers 
-        FROM Ingredients 
-        WHERE expiry < ?
-        ORDER BY expiry ASC
+        today = time.strftime("%Y-%m-%d")
+        return self.db.execute_query(Q_EXPIRED_INGREDIENTS, (today,)) or []
+    
+    def set_dish_ingredients(
+        self, dish_id: int, rows: Iterable[Tuple[int, float]]
+    ) -> int:
+        """
+        Records how much of each ingredient one portion of a dish uses
+        
+        Args:
+            rows: (ingre_id, qty) tuples; existing entries are replaced
+            
+        Returns:
+            Number of entries written (0 on failure)
+        """
+        params = ((dish_id, ingre_id, qty) for ingre_id, qty in rows)
+        return self.db.execute_many(Q_SET_DISH_INGREDIENT, params) or 0
+    
+    def deduct_stock_for_order(self, items: Sequence[Tuple[int, int]]) -> bool:
+        """
+        Deducts the ingredients used by an order from stock
+        
+        The order's dishes are loaded into a temp table and every affected
+        ingredient is updated by a single UPDATE, so the cost does not grow
+        with the number of ingredients. Nothing is deducted if any
+        ingredient would go below zero.
+        
+        Args:
+            items: The order's (dish_id, qty) pairs, as passed to create_order
+            
+        Returns:
+            True on success, False otherwise
         """
-        return self.db.execute_query(query, (today,)) or []
+        if not items:
+            logger.warning("Invalid order data")
+            return False
+        
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(Q_CREATE_ORDER_REQ)
+                conn.execute(Q_CLEAR_ORDER_REQ)
+                conn.executemany(Q_INSERT_ORDER_REQ, items)
+                shortage = conn.execute(Q_STOCK_SHORTAGE).fetchone()
+                if shortage is not None:
+                    raise _InsufficientStock(*shortage)
+                updated = conn.execute(Q_DEDUCT_STOCK).rowcount
+                conn.execute(Q_CLEAR_ORDER_REQ)
+            self._after_write()
+            logger.info("Deducted stock for %s ingredients", updated)
+            return True
+        except _InsufficientStock as e:
+            ingre_id, stock, amount = e.args
+            logger.warning(
+                "Insufficient stock for ingredient ID %s: have %s, need %s",
+                ingre_id, stock, amount
+            )
+            return False
+        except sqlite3.Error as e:
+            logger.error("Error deducting stock: %s", e)
+            return False
+
+
+class _InsufficientStock(Exception):
+    """Raised inside a transaction to roll back a stock deduction"""
 
 
-class ShipperManager:
+class ShipperManager(TableManager):
     """Handles all shipper-related operations"""
-    
-    def __init__(self, db_manager: DatabaseManager):
-        self.db = db_manager
-    
-    def get_all(self) -> List[sqlite3.Row]:
-        """Retrieves all shippers"""
-        query = "SELECT shipper_id, shipper_info FROM Shippers ORDER BY shipper_id"
-        return self.db.execute_query(query) or []
-    
-    def get_by_id(self, shipper_id: int) -> Optional[sqlite3.Row]:
-        """Finds shipper by ID"""
-        query = "SELECT shipper_id, shipper_info FROM Shippers WHERE shipper_id = ?"
-        return self.db.execute_query(query, (shipper_id,), fetch_one=True)
+    TABLE = "Shippers"
+    PK = "shipper_id"
+    ROW_TYPE = ShipperRow
+    ORDER_BY = "shipper_id"
+    NOUN = "shipper"
 
 
 class OrderManager:
@@ -522,173 +1286,253 @@ class OrderManager:
         self.db = db_manager
     
     def create_order(
-        self, dish_req_string: str, total_price: float, cus_id: int
+        self,
+        dish_req_string: str,
+        total_price: float,
+        cus_id: int,
+        items: Sequence[Tuple[int, int]],
+        conn: Optional[sqlite3.Connection] = None
     ) -> Optional[int]:
         """
-        Creates a new order
+        Creates a new order and its OrderItems rows
+        
+        Args:
+            dish_req_string: Order items as displayed, stored in Orders.dish_req
+            items: (dish_id, qty) pairs; OrderItems is written from these,
+                since dish names need not be unique
+            conn: Connection of an open transaction to insert on; the order
+                is committed on its own when omitted
         
         Returns:
             Order ID if successful, None otherwise
         """
-        if not dish_req_string or total_price <= 0:
+        if not dish_req_string or not items or total_price <= 0:
             logger.warning("Invalid order data")
             return None
         
-        order_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if conn is None:
+            try:
+                with self.db.transaction() as conn:
+                    order_id = self.create_order(
+                        dish_req_string, total_price, cus_id, items, conn=conn
+                    )
+            except sqlite3.Error as e:
+                logger.error("Failed to create order for customer %s: %s", cus_id, e)
+                return None
+            self.db.bump_version("Orders")
+            return order_id
+        
         status = OrderStatus.PENDING.value
+        params = (dish_req_string, total_price, status, cus_id)
+        order_id = self.db.insert_returning_id(conn, Q_INSERT_ORDER, params)
+        conn.executemany(
+            Q_INSERT_ORDER_ITEM,
+            ((order_id, dish_id, qty) for dish_id, qty in items)
+        )
         
-        query = """
-        INSERT INTO Orders (dish_req, total_price, order_time, status, cus_id) 
-        VALUES (?, ?, ?, ?, ?)
+        logger.info("Created order ID %s for customer %s", order_id, cus_id)
+        return order_id
+    
+    def place_order(
+        self,
+        dish_req_string: str,
+        total_price: float,
+        cus_id: int,
+        items: Sequence[Tuple[int, int]],
+        emp_id: int,
+        shipper_id: int,
+        delivery_addr: str,
+        distance: float,
+        fee: float
+    ) -> Optional[int]:
         """
-        order_id = self.db.execute_with_lastrowid(
-            query, (dish_req_string, total_price, order_time, status, cus_id)
-        )
+        Creates an order together with its bill and delivery (checkout)
+        
+        All three rows are written on one connection in one transaction, so
+        checkout costs a single commit; the bill amount is the order total
+        plus the delivery fee.
+        
+        Args:
+            items: (dish_id, qty) pairs, as for create_order
         
-        if order_id:
-            logger.info(f"Created order ID {order_id} for customer {cus_id}")
+        Returns:
+            Order ID if successful, None otherwise (nothing is written)
+        """
+        if not dish_req_string or not items or total_price <= 0:
+            logger.warning("Invalid order data")
+            return None
+        
+        try:
+            with self.db.transaction() as conn:
+                order_id = self.create_order(
+                    dish_req_string, total_price, cus_id, items, conn=conn
+                )
+                self.create_bill(
+                    order_id, emp_id, shipper_id, total_price + fee, conn=conn
+                )
+                self.add_delivery(
+                    order_id, shipper_id, delivery_addr, distance, fee, conn=conn
+                )
+        except sqlite3.Error as e:
+            logger.error("Failed to place order for customer %s: %s", cus_id, e)
+            return None
         
+        self.db.bump_version("Orders")
+        self.db.bump_version("Bills")
+        logger.info("Placed order ID %s with bill and delivery", order_id)
         return order_id
     
     def create_bill(
-        self, order_id: int, emp_id: int, shipper_id: int, total_amount: float
+        self,
+        order_id: int,
+        emp_id: int,
+        shipper_id: int,
+        total_amount: float,
+        conn: Optional[sqlite3.Connection] = None
     ) -> bool:
-        """Creates a bill for an order"""
-        bill_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        query = """
-        INSERT INTO Bills (order_id, emp_id, shipper_id, total_amount, bill_time) 
-        VALUES (?, ?, ?, ?, ?)
         """
-        result = self.db.execute_query(
-            query, (order_id, emp_id, shipper_id, total_amount, bill_time), commit=True
-        )
+        Creates a bill for an order
+        
+        Args:
+            conn: Connection of an open transaction to insert on; the caller
+                then commits and bumps the Bills version
+        """
+        params = (order_id, emp_id, shipper_id, total_amount)
+        if conn is not None:
+            conn.execute(Q_INSERT_BILL, params)
+            return True
         
+        result = self.db.execute_query(Q_INSERT_BILL, params, commit=True)
         if result:
-            logger.info(f"Created bill for order {order_id}")
+            self.db.bump_version("Bills")
+            logger.info("Created bill for order %s", order_id)
         return bool(result)
     
     def add_delivery(
-        self, order_id: int, shipper_id: int, delivery_addr: str, distance: float, fee: float
+        self,
+        order_id: int,
+        shipper_id: int,
+        delivery_addr: str,
+        distance: float,
+        fee: float,
+        conn: Optional[sqlite3.Connection] = None
     ) -> bool:
-        """Adds delivery information"""
-        delivery_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        query = """
-        INSERT INTO Deliveries (order_id, shipper_id, delivery_time, delivery_addr, distance, fee) 
-        VALUES (?, ?, ?, ?, ?, ?)
         """
-        result = self.db.execute_query(
-            query, (order_id, shipper_id, delivery_time, delivery_addr, distance, fee), 
-            commit=True
-        )
+        Adds delivery information
+        
+        Args:
+            conn: Connection of an open transaction to insert on; the caller
+                then commits
+        """
+        params = (order_id, shipper_id, delivery_addr, distance, fee)
+        if conn is not None:
+            conn.execute(Q_INSERT_DELIVERY, params)
+            return True
+        
+        result = self.db.execute_query(Q_INSERT_DELIVERY, params, commit=True)
         
         if result:
-            logger.info(f"Added delivery for order {order_id}")
+            logger.info("Added delivery for order %s", order_id)
         return bool(result)
     
-    def get_all_orders_details(self) -> List[sqlite3.Row]:
-        """Retrieves all orders with customer details"""
-        query = """
-        SELECT 
-            o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
-            c.cus_name, c.cus_phone
-        FROM 
-            Orders o
-        JOIN 
-            Customers c ON o.cus_id = c.cus_id
-        ORDER BY 
-            o.order_time DESC
-        """
-        return self.db.execute_query(query) or []
+    def create_bills(self, rows: Iterable[Tuple[int, int, int, float]]) -> int:
+        """
+        Creates bills in a single transaction
+        
+        Args:
+            rows: (order_id, emp_id, shipper_id, total_amount) tuples
+            
+        Returns:
+            Number of bills created (0 on failure)
+        """
+        created = self.db.execute_many(Q_INSERT_BILL, rows) or 0
+        if created:
+            self.db.bump_version("Bills")
+        return created
+    
+    def add_deliveries(
+        self, rows: Iterable[Tuple[int, int, str, float, float]]
+    ) -> int:
+        """
+        Adds delivery information in a single transaction
+        
+        Args:
+            rows: (order_id, shipper_id, delivery_addr, distance, fee) tuples
+            
+        Returns:
+            Number of deliveries added (0 on failure)
+        """
+        return self.db.execute_many(Q_INSERT_DELIVERY, rows) or 0
+    
+    def get_all_orders_details(self, typed: bool = False) -> List[sqlite3.Row]:
+        """Retrieves all orders with customer details (OrderDetailRow if typed)"""
+        row_type = OrderDetailRow if typed else None
+        return self.db.execute_query(Q_ALL_ORDER_DETAILS, row_type=row_type) or []
+    
+    def iter_orders_details(self, typed: bool = False) -> Iterator[sqlite3.Row]:
+        """Streams all orders with customer details, newest first"""
+        row_type = OrderDetailRow if typed else None
+        return self.db.execute_iter(Q_ALL_ORDER_DETAILS, row_type=row_type)
+    
+    def get_recent_orders(self, limit: int = 10, typed: bool = False) -> List[sqlite3.Row]:
+        """Retrieves the newest orders with customer details"""
+        row_type = OrderDetailRow if typed else None
+        return self.db.execute_query(
+            Q_RECENT_ORDER_DETAILS, (limit,), row_type=row_type
+        ) or []
     
     def get_order_by_id(self, order_id: int) -> Optional[sqlite3.Row]:
         """Gets detailed order information"""
-        query = """
-        SELECT 
-            o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
-            c.cus_id, c.cus_name, c.cus_phone
-        FROM 
-            Orders o
-        JOIN 
-            Customers c ON o.cus_id = c.cus_id
-        WHERE 
-            o.order_id = ?
-        """
-        return self.db.execute_query(query, (order_id,), fetch_one=True)
+        return self.db.execute_query(Q_ORDER_BY_ID, (order_id,), fetch_one=True)
     
     def update_status(self, order_id: int, status: str) -> bool:
         """Updates order status"""
-        # Validate status
-        try:
-            OrderStatus(status)
-        except ValueError:
-            logger.warning(f"Invalid order status: {status}")
+        if status not in _VALID_STATUSES:
+            logger.warning("Invalid order status: %s", status)
             return False
         
-        query = "UPDATE Orders SET status = ? WHERE order_id = ?"
-        result = self.db.execute_query(query, (status, order_id), commit=True)
-        
+        result = self.db.execute_query(Q_UPDATE_ORDER_STATUS, (status, order_id), commit=True)
         if result:
-            logger.info(f"Updated order {order_id} status to {status}")
+            self.db.bump_version("Orders")
+            logger.info("Updated order %s status to %s", order_id, status)
         return bool(result)
     
     def get_delivery_info(self, order_id: int) -> Optional[sqlite3.Row]:
         """Retrieves delivery details for an order"""
-        query = """
-        SELECT 
-            d.delivery_addr, d.distance, d.fee, d.delivery_time,
-            s.shipper_info
-        FROM 
-            Deliveries d
-        JOIN 
-            Shippers s ON d.shipper_id = s.shipper_id
-        WHERE 
-            d.order_id = ?
-        """
-        return self.db.execute_query(query, (order_id,), fetch_one=True)
+        return self.db.execute_query(Q_DELIVERY_INFO, (order_id,), fetch_one=True)
     
     def get_orders_by_status(self, status: str) -> List[sqlite3.Row]:
         """Gets orders filtered by status"""
-        query = """
-        SELECT 
-            o.order_id, o.dish_req, o.total_price, o.order_time, o.status,
-            c.cus_name, c.cus_phone
-        FROM 
-            Orders o
-        JOIN 
-            Customers c ON o.cus_id = c.cus_id
-        WHERE 
-            o.status = ?
-        ORDER BY 
-            o.order_time DESC
-        """
-        return self.db.execute_query(query, (status,)) or []
+        return self.db.execute_query(Q_ORDERS_BY_STATUS, (status,)) or []
+    
+    def get_stats(self) -> Tuple[int, float]:
+        """Returns (order count, total revenue) across all orders"""
+        result = self.db.execute_query(Q_ORDER_STATS, fetch_one=True, raw=True)
+        return (result[0], result[1]) if result else (0, 0.0)
     
     def get_revenue_report(
         self, start_date: Optional[str] = None, end_date: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generates revenue report for date range"""
         if not start_date:
-            start_date = (datetime.datetime.now() - datetime.timedelta(days=30)).strftime("%Y-%m-%d")
+            start_date = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 86400))
         if not end_date:
-            end_date = datetime.datetime.now().strftime("%Y-%m-%d")
+            end_date = time.strftime("%Y-%m-%d")
         
-        query = """
-        SELECT 
-            COUNT(*) as total_orders,
-            SUM(total_price) as total_revenue,
-            AVG(total_price) as avg_order_value
-        FROM Orders
-        WHERE DATE(order_time) BETWEEN ? AND ?
-        """
-        result = self.db.execute_query(query, (start_date, end_date), fetch_one=True)
+        # Half-open range on the raw column so idx_orders_time can be used
+        bounds = (start_date + " 00:00:00", end_date + " 00:00:00")
+        result = self.db.execute_query(
+            Q_REVENUE_REPORT, bounds, fetch_one=True, raw=True
+        )
         
         if result:
+            total_orders, total_revenue, avg_order_value = result
             return {
                 'start_date': start_date,
                 'end_date': end_date,
-                'total_orders': result['total_orders'] or 0,
-                'total_revenue': result['total_revenue'] or 0.0,
-                'avg_order_value': result['avg_order_value'] or 0.0
+                'total_orders': total_orders or 0,
+                'total_revenue': total_revenue or 0.0,
+                'avg_order_value': avg_order_value or 0.0
             }
         return {}
 
@@ -698,8 +1542,8 @@ class OrderManager:
 class FoodManagementSystem:
     """Main facade class providing access to all managers"""
     
-    def __init__(self, db_name: str = DATABASE_NAME):
-        self.db_manager = DatabaseManager(db_name)
+    def __init__(self, db_name: str = DATABASE_NAME, pool_size: int = POOL_SIZE):
+        self.db_manager = DatabaseManager(db_name, pool_size)
         self.customers = CustomerManager(self.db_manager)
         self.employees = EmployeeManager(self.db_manager)
         self.dishes = DishManager(self.db_manager)
@@ -707,17 +1551,50 @@ class FoodManagementSystem:
         self.shippers = ShipperManager(self.db_manager)
         self.orders = OrderManager(self.db_manager)
         
+        self._bulk_loaders = {
+            "Customers": self.customers.add_many,
+            "Employees": self.employees.add_many,
+            "Dishes": self.dishes.add_many,
+            "Ingredients": self.ingredients.add_many,
+        }
+        
+        self.db_manager.ensure_schema()
         logger.info("Food Management System initialized")
     
+    def bulk_load(self, table: str, rows: Iterable[Tuple]) -> int:
+        """
+        Inserts many rows into a table in one transaction
+        
+        Args:
+            table: One of Customers, Employees, Dishes or Ingredients
+            rows: Tuples in the order taken by that manager's add()
+            
+        Returns:
+            Number of rows added (0 on failure)
+        """
+        loader = self._bulk_loaders.get(table)
+        if loader is None:
+            logger.warning("Bulk load not supported for table: %s", table)
+            return 0
+        return loader(rows)
+    
+    async def run_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a blocking manager call in a worker thread
+        
+        Each worker borrows its own pooled connection, so independent reads
+        can be awaited together, e.g.
+        await asyncio.gather(system.run_async(system.customers.get_all),
+                             system.run_async(system.dishes.get_all))
+        """
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
     def health_check(self) -> bool:
         """Checks if database is accessible"""
         try:
-            with self.db_manager.get_connection() as conn:
-                cur = conn.cursor()
-                cur.execute("SELECT 1")
-                return True
+            return self.db_manager.execute_query(Q_PING, fetch_one=True, raw=True) == (1,)
         except Exception as e:
-            logger.error(f"Health check failed: {e}")
+            logger.error("Health check failed: %s", e)
             return False
 
 
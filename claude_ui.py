@@ -7,7 +7,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import sqlite3
 from datetime import datetime, timedelta
-import random
+import functools
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import difflib
+from operator import itemgetter
+from types import MappingProxyType
 
 # Import the backend (assuming it's in the same directory)
 try:
@@ -16,46 +22,188 @@ except ImportError:
     print("Warning: Backend module not found. Running in demo mode.")
     FoodManagementSystem = None
 
+logger = logging.getLogger(__name__)
+
+# Color scheme, shared by every window
+COLORS = MappingProxyType({
+    'primary': '#FF6B6B',
+    'secondary': '#4ECDC4',
+    'success': '#95E1D3',
+    'warning': '#F38181',
+    'info': '#AA96DA',
+    'dark': '#2C3E50',
+    'light': '#ECF0F1'
+})
+
+# Choices offered by the order status dialog, first one is the default
+ORDER_STATUSES = ("Pending", "Preparing", "Ready", "Delivered", "Cancelled")
+
+# ttk styles are global to the Tcl interpreter, so they only need configuring once
+_STYLES_CONFIGURED = False
+
+# Treeview row tags, configured once per table when it is built
+ROW_TAG_STYLES = {
+    'low_stock': {'background': '#ffe6e6'},
+}
+
+# Ingredients below this stock are tagged low_stock
+LOW_STOCK_THRESHOLD = 10
+
+# Backend tables whose changes affect the dashboard
+DASHBOARD_TABLES = frozenset({"Orders", "Customers", "Dishes"})
+
+# Fallback interval for picking up changes made outside this process
+STATS_REFRESH_MS = 30_000
+
+# Quiet period after the last keystroke before a search filters the table
+SEARCH_DELAY_MS = 150
+
+# How often the Tk thread runs callbacks queued by worker threads
+MAIN_QUEUE_POLL_MS = 50
+
+# How long a status bar message stays up
+FLASH_MS = 3000
+
+# Startup fade: alpha added per tick and delay between ticks
+FADE_STEP = 0.25
+FADE_MS = 30
+
+
+@functools.lru_cache(maxsize=None)
+def rounded_rect_points(width, height=40, pad=5, r=8):
+    """Polygon points for a button's rounded rectangle, shared per size"""
+    # Doubled points keep the edges straight so the spline only bends at
+    # the corners
+    x1, y1, x2, y2 = pad, pad, width - pad, height - pad
+    return (
+        x1+r, y1, x1+r, y1, x2-r, y1, x2-r, y1, x2, y1,
+        x2, y1+r, x2, y1+r, x2, y2-r, x2, y2-r, x2, y2,
+        x2-r, y2, x2-r, y2, x1+r, y2, x1+r, y2, x1, y2,
+        x1, y2-r, x1, y2-r, x1, y1+r, x1, y1+r, x1, y1,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def format_price(value):
+    """Formats a price for display; prices repeat, so results are memoized"""
+    return f"${value:.2f}"
+
+
+def ellipsize(text, n=30):
+    """Shortens text to n characters plus an ellipsis"""
+    return text if len(text) <= n else text[:n] + "..."
+
+
+def row_getter(keys=None):
+    """Returns a function mapping a backend row to Treeview values"""
+    # With no keys the row's own column order is used as-is
+    if keys is None:
+        return tuple
+    return itemgetter(*keys)
+
+
+def build_entry_form(form, fields):
+    """Grid a label and entry per (label, key) field; returns entries by key"""
+    entries = {}
+    for i, (label, key) in enumerate(fields):
+        tk.Label(form, text=label, font=("Segoe UI", 11, "bold"),
+                bg="white").grid(row=i, column=0, sticky="w", pady=10)
+        
+        entry = tk.Entry(form, font=("Segoe UI", 11), relief="solid",
+                       borderwidth=1, width=30)
+        entry.grid(row=i, column=1, pady=10, padx=(10, 0), sticky="ew")
+        entries[key] = entry
+    
+    form.grid_columnconfigure(1, weight=1)
+    return entries
+
+
+# Form parsers: each returns the arguments for the manager's add(), or
+# None when the form data is invalid
+
+def parse_customer(data):
+    if not data['name'] or not data['phone']:
+        return None
+    return data['name'], data['phone']
+
+
+def parse_dish(data):
+    try:
+        return data['name'], data['recipe'], int(data['time']), float(data['price'])
+    except (ValueError, KeyError):
+        return None
+
+
+def parse_ingredient(data):
+    try:
+        stock = float(data['stock'])
+    except (ValueError, KeyError):
+        return None
+    return data['name'], stock, data['unit'], data['expiry'], data['supplier']
+
+
+def parse_employee(data):
+    return (data['name'],)
+
+
+# Add forms by kind: (parser, invalid data message, manager and view name,
+# noun for messages, GUI cache attribute cleared on success or None)
+SAVE_SPECS = {
+    "customer": (parse_customer, "All fields are required", "customers", "Customer", "_customers_cache"),
+    "dish": (parse_dish, "Invalid time or price", "dishes", "Dish", "_dishes_cache"),
+    "ingredient": (parse_ingredient, "Invalid stock amount", "ingredients", "Ingredient", None),
+    "employee": (parse_employee, None, "employees", "Employee", None),
+}
+
+
 class ModernButton(tk.Canvas):
     """Custom animated button with gradient and hover effects"""
-    def __init__(self, parent, text, command, bg_color="#4CAF50", hover_color="#45a049", **kwargs):
-        super().__init__(parent, height=40, highlightthickness=0, **kwargs)
+    # Shared bind tag: the event handlers are bound once for all buttons
+    BIND_TAG = "ModernButton"
+    
+    def __init__(self, parent, text, command, bg_color="#4CAF50", hover_color="#45a049",
+                 width=120, **kwargs):
+        super().__init__(parent, width=width, height=40, highlightthickness=0, **kwargs)
         self.command = command
         self.bg_color = bg_color
         self.hover_color = hover_color
         self.text = text
+        self.width = width
         self.is_hovered = False
         
-        self.draw_button()
-        self.bind("<Button-1>", self.on_click)
-        self.bind("<Enter>", self.on_enter)
-        self.bind("<Leave>", self.on_leave)
+        self._build_shapes()
+        self.bindtags((self.BIND_TAG,) + self.bindtags())
+        if not self.bind_class(self.BIND_TAG):
+            self.bind_class(self.BIND_TAG, "<Button-1>", lambda e: e.widget.on_click(e))
+            self.bind_class(self.BIND_TAG, "<Enter>", lambda e: e.widget.on_enter(e))
+            self.bind_class(self.BIND_TAG, "<Leave>", lambda e: e.widget.on_leave(e))
     
-    def draw_button(self):
-        self.delete("all")
-        color = self.hover_color if self.is_hovered else self.bg_color
+    def _build_shapes(self):
+        # Canvas items are created once; state changes only recolor them
+        color = self.bg_color
         
-        # Draw rounded rectangle
-        x1, y1, x2, y2 = 5, 5, self.winfo_reqwidth() - 5, 35
-        r = 15
-        self.create_arc(x1, y1, x1+r, y1+r, start=90, extent=90, fill=color, outline=color)
-        self.create_arc(x2-r, y1, x2, y1+r, start=0, extent=90, fill=color, outline=color)
-        self.create_arc(x1, y2-r, x1+r, y2, start=180, extent=90, fill=color, outline=color)
-        self.create_arc(x2-r, y2-r, x2, y2, start=270, extent=90, fill=color, outline=color)
-        self.create_rectangle(x1+r/2, y1, x2-r/2, y2, fill=color, outline=color)
-        self.create_rectangle(x1, y1+r/2, x2, y2-r/2, fill=color, outline=color)
+        # Rounded rectangle as one smoothed polygon
+        self._shape_id = self.create_polygon(rounded_rect_points(self.width),
+                                             smooth=True, splinesteps=12,
+                                             fill=color, outline="")
         
         # Add text
-        self.create_text(self.winfo_reqwidth()//2, 20, text=self.text, 
+        self.create_text(self.width//2, 20, text=self.text, 
                         fill="white", font=("Segoe UI", 10, "bold"))
     
+    def _set_color(self, color):
+        self.itemconfigure(self._shape_id, fill=color)
+    
+    def _current_color(self):
+        return self.hover_color if self.is_hovered else self.bg_color
+    
     def on_enter(self, e):
         self.is_hovered = True
-        self.draw_button()
+        self._set_color(self.hover_color)
     
     def on_leave(self, e):
         self.is_hovered = False
-        self.draw_button()
+        self._set_color(self.bg_color)
     
     def on_click(self, e):
         self.animate_click()
@@ -63,63 +211,147 @@ class ModernButton(tk.Canvas):
             self.command()
     
     def animate_click(self):
-        original_color = self.bg_color
-        self.bg_color = "#333333"
-        self.draw_button()
-        self.after(100, lambda: setattr(self, 'bg_color', original_color) or self.draw_button())
+        self._set_color("#333333")
+        self.after(100, lambda: self._set_color(self._current_color()))
 
 
-class AnimatedCard(tk.Frame):
-    """Animated card widget with shadow effect"""
+class AnimatedCard(tk.Canvas):
+    """Animated card widget with shadow effect, drawn as canvas items"""
     def __init__(self, parent, title, value, icon, color, **kwargs):
-        super().__init__(parent, bg="#ffffff", relief="flat", **kwargs)
+        super().__init__(parent, bg="#ffffff", height=120, highlightthickness=0, **kwargs)
         self.color = color
+        self.value = value
         self.lifted = False
         
-        # Border frame for shadow effect
-        self.border = tk.Frame(self, bg="#e0e0e0", padx=2, pady=2)
-        self.border.pack(fill="both", expand=True)
-        
-        # Main content frame
-        content = tk.Frame(self.border, bg="#ffffff")
-        content.pack(fill="both", expand=True)
+        # Border rectangle for shadow effect; resized with the card
+        self.rect = self.create_rectangle(1, 1, 2, 2, outline="#e0e0e0", width=2)
         
         # Icon and title
-        header = tk.Frame(content, bg="#ffffff")
-        header.pack(fill="x", padx=20, pady=(15, 5))
-        
-        icon_label = tk.Label(header, text=icon, font=("Segoe UI Emoji", 24), 
-                             bg="#ffffff", fg=color)
-        icon_label.pack(side="left", padx=(0, 10))
-        
-        title_label = tk.Label(header, text=title, font=("Segoe UI", 11), 
-                              bg="#ffffff", fg="#666666")
-        title_label.pack(side="left", anchor="w")
+        self.icon_item = self.create_text(20, 35, text=icon, anchor="w",
+                                          font=("Segoe UI Emoji", 24), fill=color)
+        title_x = self.bbox(self.icon_item)[2] + 10
+        self.title_item = self.create_text(title_x, 35, text=title, anchor="w",
+                                           font=("Segoe UI", 11), fill="#666666")
         
         # Value
-        self.value_label = tk.Label(content, text=value, font=("Segoe UI", 28, "bold"),
-                                    bg="#ffffff", fg=color)
-        self.value_label.pack(padx=20, pady=(0, 15), anchor="w")
+        self.value_item = self.create_text(20, 85, text=value, anchor="w",
+                                           font=("Segoe UI", 28, "bold"), fill=color)
         
         # Hover effects
+        self.bind("<Configure>", self.on_resize)
         self.bind("<Enter>", self.on_enter)
         self.bind("<Leave>", self.on_leave)
-        for widget in [content, header, icon_label, title_label, self.value_label]:
-            widget.bind("<Enter>", self.on_enter)
-            widget.bind("<Leave>", self.on_leave)
+    
+    def on_resize(self, e):
+        self.coords(self.rect, 1, 1, e.width - 2, e.height - 2)
     
     def on_enter(self, e):
         if not self.lifted:
             self.lifted = True
-            self.border.configure(bg=self.color, padx=3, pady=3)
+            self.itemconfigure(self.rect, outline=self.color, width=3)
     
     def on_leave(self, e):
         if self.lifted:
             self.lifted = False
-            self.border.configure(bg="#e0e0e0", padx=2, pady=2)
+            self.itemconfigure(self.rect, outline="#e0e0e0", width=2)
     
     def update_value(self, new_value):
-        self.value_label.configure(text=new_value)
+        if new_value != self.value:
+            self.value = new_value
+            self.itemconfigure(self.value_item, text=new_value)
+
+
+class BaseDialog(tk.Toplevel):
+    """Modal dialog with a colored header, a body frame and action buttons"""
+    # Screen size, read once per app; dialogs are centered from it
+    _screen_size = None
+    
+    def __init__(self, root, title, header_text, primary_text, primary_cb,
+                 width=500, height=400, header_color=COLORS['secondary'],
+                 primary_color=COLORS['success'], header_font_size=20,
+                 pad=40, button_width=120, reusable=False):
+        super().__init__(root)
+        # Reusable dialogs are hidden on close so they can be shown again
+        self.reusable = reusable
+        self.title(title)
+        self.center(width, height)
+        self.configure(bg="white")
+        self.transient(root)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.grab_set()
+        
+        # Header
+        header = tk.Frame(self, bg=header_color, height=header_font_size * 4)
+        header.pack(fill="x")
+        
+        self.header_label = tk.Label(header, text=header_text,
+                                     font=("Segoe UI", header_font_size, "bold"),
+                                     bg=header_color, fg="white")
+        self.header_label.pack(pady=header_font_size + 5)
+        
+        # Body, filled in by the caller
+        self.body = tk.Frame(self, bg="white")
+        self.body.pack(fill="both", expand=True, padx=pad, pady=30)
+        
+        # Buttons
+        btn_frame = tk.Frame(self, bg="white")
+        btn_frame.pack(fill="x", padx=pad, pady=(0, pad - 10))
+        
+        btn_primary = ModernButton(btn_frame, primary_text, primary_cb,
+                                   bg_color=primary_color, width=button_width)
+        btn_primary.pack(side="right", padx=(10, 0))
+        
+        btn_cancel = ModernButton(btn_frame, "✖ Cancel", self.close,
+                                  bg_color="#95a5a6", width=button_width)
+        btn_cancel.pack(side="right")
+    
+    def center(self, w, h):
+        """Size the dialog and center it on screen in one geometry call"""
+        if BaseDialog._screen_size is None:
+            BaseDialog._screen_size = (self.winfo_screenwidth(), self.winfo_screenheight())
+        screen_w, screen_h = BaseDialog._screen_size
+        self.geometry(f"{w}x{h}+{(screen_w - w) // 2}+{(screen_h - h) // 2}")
+    
+    def close(self):
+        if self.reusable:
+            self.grab_release()
+            self.withdraw()
+        else:
+            self.destroy()
+    
+    def reshow(self):
+        self.deiconify()
+        self.grab_set()
+
+
+class ConfirmDialog(BaseDialog):
+    """Reusable yes/no dialog; ask() blocks until the user answers"""
+    
+    def __init__(self, root):
+        super().__init__(root, "Confirm Delete", "🗑 Confirm Delete", "✔ Delete",
+                         self._yes, width=420, height=260,
+                         header_color=COLORS['warning'], primary_color=COLORS['warning'],
+                         header_font_size=18, pad=30, reusable=True)
+        self.message = tk.Label(self.body, font=("Segoe UI", 12), bg="white",
+                                wraplength=340, justify="center")
+        self.message.pack(expand=True)
+        self.result = False
+        self._answered = tk.BooleanVar(self)
+    
+    def _yes(self):
+        self.result = True
+        self.close()
+    
+    def close(self):
+        super().close()
+        self._answered.set(True)
+    
+    def ask(self, message):
+        self.result = False
+        self.message.configure(text=message)
+        self.reshow()
+        self.wait_variable(self._answered)
+        return self.result
 
 
 class FoodManagementGUI:
@@ -134,29 +366,48 @@ class FoodManagementGUI:
             self.system = FoodManagementSystem()
         else:
             self.system = None
+        # Without a backend, dialogs that write data are never opened
+        self._demo_mode = self.system is None
         
         # Color scheme
-        self.colors = {
-            'primary': '#FF6B6B',
-            'secondary': '#4ECDC4',
-            'success': '#95E1D3',
-            'warning': '#F38181',
-            'info': '#AA96DA',
-            'dark': '#2C3E50',
-            'light': '#ECF0F1'
-        }
+        self.colors = COLORS
+        
+        # Customer and dish lists for the order dialog; reset on every write
+        self._customers_cache = None
+        self._dishes_cache = None
+        # Set when the backend reports a change to a dashboard table
+        self._stats_dirty = True
+        
+        # Form dialogs are built on first use, then hidden and reshown
+        self._dialog_cache = {}
+        # Backend adds and deletes run here so the event loop never waits on the DB
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gui-io")
+        # Callbacks from worker threads; only the Tk thread may call into Tk
+        self._main_queue = queue.Queue()
+        self.root.after(MAIN_QUEUE_POLL_MS, self.drain_main_queue)
         
         # Setup UI
         self.setup_styles()
+        self.create_status_bar()
         self.create_sidebar()
         self.create_main_content()
-        self.show_dashboard()
+        # First paint happens once the mainloop is running, so the window
+        # appears before the dashboard's queries run
+        self.root.after(10, lambda: self.switch_view("dashboard"))
         
-        # Start animation loop
-        self.animate_cards()
+        # Backend writes push dashboard updates; the poll only catches
+        # changes made by other processes
+        if self.system:
+            self.system.db_manager.subscribe(self.on_data_changed)
+            self.root.after(STATS_REFRESH_MS, self.poll_stats)
     
     def setup_styles(self):
         """Configure ttk styles"""
+        global _STYLES_CONFIGURED
+        if _STYLES_CONFIGURED:
+            return
+        _STYLES_CONFIGURED = True
+        
         style = ttk.Style()
         style.theme_use('clam')
         
@@ -180,42 +431,64 @@ class FoodManagementGUI:
         # Configure Combobox
         style.configure("TCombobox", fieldbackground="white", font=("Segoe UI", 10))
     
+    def create_status_bar(self):
+        """Status bar along the bottom of the window, for non-blocking feedback"""
+        self.status = tk.Label(self.root, bg="#222", fg="white", anchor="w",
+                               font=("Segoe UI", 10), padx=10)
+        # Packed before the sidebar so it spans the whole window width
+        self.status.pack(side="bottom", fill="x")
+        self._flash_after = None
+    
+    def flash(self, msg, color=COLORS['success']):
+        """Show msg in the status bar for FLASH_MS, replacing any earlier one"""
+        if self._flash_after is not None:
+            self.root.after_cancel(self._flash_after)
+        self.status.configure(text=msg, bg=color, fg=COLORS['dark'])
+        self._flash_after = self.root.after(FLASH_MS, self._clear_flash)
+    
+    def _clear_flash(self):
+        self._flash_after = None
+        self.status.configure(text="", bg="#222", fg="white")
+    
     def create_sidebar(self):
         """Create animated sidebar with navigation"""
-        self.sidebar = tk.Frame(self.root, bg=self.colors['dark'], width=250)
+        colors = self.colors
+        dark, primary = colors['dark'], colors['primary']
+        
+        self.sidebar = tk.Frame(self.root, bg=dark, width=250)
         self.sidebar.pack(side="left", fill="y")
         self.sidebar.pack_propagate(False)
         
         # Logo/Title with gradient effect
-        title_frame = tk.Frame(self.sidebar, bg=self.colors['primary'], height=100)
+        title_frame = tk.Frame(self.sidebar, bg=primary, height=100)
         title_frame.pack(fill="x", pady=(0, 30))
         
         logo = tk.Label(title_frame, text="🍽️", font=("Segoe UI Emoji", 40),
-                       bg=self.colors['primary'], fg="white")
+                       bg=primary, fg="white")
         logo.pack(pady=(20, 5))
         
         title = tk.Label(title_frame, text="Food Manager", 
                         font=("Segoe UI", 16, "bold"),
-                        bg=self.colors['primary'], fg="white")
+                        bg=primary, fg="white")
         title.pack()
         
         # Navigation buttons
         nav_items = [
-            ("📊 Dashboard", "dashboard", self.colors['info']),
-            ("👥 Customers", "customers", self.colors['secondary']),
-            ("🍕 Dishes", "dishes", self.colors['warning']),
-            ("📦 Ingredients", "ingredients", self.colors['success']),
-            ("🛒 Orders", "orders", self.colors['primary']),
-            ("👨‍🍳 Employees", "employees", self.colors['info']),
+            ("📊 Dashboard", "dashboard", colors['info']),
+            ("👥 Customers", "customers", colors['secondary']),
+            ("🍕 Dishes", "dishes", colors['warning']),
+            ("📦 Ingredients", "ingredients", colors['success']),
+            ("🛒 Orders", "orders", primary),
+            ("👨‍🍳 Employees", "employees", colors['info']),
         ]
         
         self.nav_buttons = {}
         for text, key, color in nav_items:
-            btn_frame = tk.Frame(self.sidebar, bg=self.colors['dark'])
+            btn_frame = tk.Frame(self.sidebar, bg=dark)
             btn_frame.pack(fill="x", padx=15, pady=5)
             
             btn = tk.Button(btn_frame, text=text, font=("Segoe UI", 12, "bold"),
-                          bg=self.colors['dark'], fg="white", 
+                          bg=dark, fg="white", 
                           activebackground=color, activeforeground="white",
                           relief="flat", anchor="w", padx=20, pady=12,
                           command=lambda k=key: self.switch_view(k))
@@ -224,49 +497,82 @@ class FoodManagementGUI:
         
         # Footer
         footer = tk.Label(self.sidebar, text="v2.0 - Premium Edition",
-                         font=("Segoe UI", 8), bg=self.colors['dark'], fg="#7f8c8d")
+                         font=("Segoe UI", 8), bg=dark, fg="#7f8c8d")
         footer.pack(side="bottom", pady=20)
     
     def create_main_content(self):
         """Create main content area"""
         self.main_frame = tk.Frame(self.root, bg="#f5f5f5")
         self.main_frame.pack(side="right", fill="both", expand=True)
+        
+        # Views are built on first visit and kept; switching only repacks them
+        self._views = {}
+        self._current_view = None
+        # Last rows loaded into each Treeview, keyed by widget path
+        self._table_snapshots = {}
+        # Values shown by each Treeview item, keyed by widget path then item ID
+        self._tree_rows = {}
+        # Lowercased search text of each table's rows, keyed by widget path
+        self._search_indexes = {}
+        # Rows fetched for each view, keyed by view name, as (versions, rows)
+        self._source_cache = {}
+    
+    def cached_source(self, name, tables, fetch):
+        """
+        Wrap a backend query so it reruns only after one of tables changes
+        
+        Rows are kept against the backend's table versions, which every
+        write bumps, so switching back to a view costs no query.
+        """
+        if not self.system:
+            return lambda: []
+        version = self.system.db_manager.version
+        cache = self._source_cache
+        
+        def source():
+            key = tuple(map(version, tables))
+            entry = cache.get(name)
+            if entry is None or entry[0] != key:
+                entry = cache[name] = (key, fetch())
+            return entry[1]
+        
+        return source
     
-    def clear_main_frame(self):
-        """Clear main content area"""
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
+    def _build_view(self, view):
+        """Build a view's widgets once, returning its frame and refresh function"""
+        builders = {
+            "dashboard": self.build_dashboard,
+            "customers": self.build_customers,
+            "dishes": self.build_dishes,
+            "ingredients": self.build_ingredients,
+            "orders": self.build_orders,
+            "employees": self.build_employees,
+        }
+        frame = tk.Frame(self.main_frame, bg="#f5f5f5")
+        refresh = builders[view](frame)
+        return frame, refresh
     
     def switch_view(self, view):
-        """Switch between different views with animation"""
+        """Switch between different views, reloading the shown view's data"""
         # Highlight active button
+        active, idle = self.colors['primary'], self.colors['dark']
         for key, btn in self.nav_buttons.items():
-            if key == view:
-                btn.configure(bg=self.colors['primary'])
-            else:
-                btn.configure(bg=self.colors['dark'])
-        
-        # Fade out animation (simple version)
-        self.clear_main_frame()
-        
-        # Show selected view
-        if view == "dashboard":
-            self.show_dashboard()
-        elif view == "customers":
-            self.show_customers()
-        elif view == "dishes":
-            self.show_dishes()
-        elif view == "ingredients":
-            self.show_ingredients()
-        elif view == "orders":
-            self.show_orders()
-        elif view == "employees":
-            self.show_employees()
-    
-    def show_dashboard(self):
-        """Display dashboard with statistics and charts"""
+            btn.configure(bg=active if key == view else idle)
+        
+        if self._current_view is not None and self._current_view != view:
+            self._views[self._current_view][0].pack_forget()
+        
+        if view not in self._views:
+            self._views[view] = self._build_view(view)
+        frame, refresh = self._views[view]
+        frame.pack(fill="both", expand=True)
+        self._current_view = view
+        refresh()
+    
+    def build_dashboard(self, parent):
+        """Build dashboard with statistics and charts"""
         # Header
-        header = tk.Frame(self.main_frame, bg="#f5f5f5")
+        header = tk.Frame(parent, bg="#f5f5f5")
         header.pack(fill="x", padx=30, pady=(30, 20))
         
         title = tk.Label(header, text="Dashboard Overview", 
@@ -281,36 +587,25 @@ class FoodManagementGUI:
         date_label.pack(side="right", pady=(10, 0))
         
         # Stats cards
-        stats_frame = tk.Frame(self.main_frame, bg="#f5f5f5")
+        stats_frame = tk.Frame(parent, bg="#f5f5f5")
         stats_frame.pack(fill="x", padx=30, pady=(0, 30))
         
-        # Get actual data if backend available
-        total_orders = len(self.system.orders.get_all_orders_details()) if self.system else 0
-        total_customers = len(self.system.customers.get_all()) if self.system else 0
-        total_dishes = len(self.system.dishes.get_all()) if self.system else 0
-        
-        # Calculate revenue
-        revenue = 0
-        if self.system:
-            orders = self.system.orders.get_all_orders_details()
-            revenue = sum(order['total_price'] for order in orders)
-        
         self.stat_cards = []
         stats_data = [
-            ("Total Revenue", f"${revenue:,.2f}", "💰", self.colors['success']),
-            ("Orders Today", str(total_orders), "🛒", self.colors['warning']),
-            ("Active Customers", str(total_customers), "👥", self.colors['secondary']),
-            ("Menu Items", str(total_dishes), "🍕", self.colors['info'])
+            ("Total Revenue", "💰", self.colors['success']),
+            ("Orders Today", "🛒", self.colors['warning']),
+            ("Active Customers", "👥", self.colors['secondary']),
+            ("Menu Items", "🍕", self.colors['info'])
         ]
         
-        for i, (title, value, icon, color) in enumerate(stats_data):
-            card = AnimatedCard(stats_frame, title, value, icon, color)
+        for i, (title, icon, color) in enumerate(stats_data):
+            card = AnimatedCard(stats_frame, title, "", icon, color)
             card.grid(row=0, column=i, padx=10, sticky="ew")
             stats_frame.grid_columnconfigure(i, weight=1)
             self.stat_cards.append(card)
         
         # Recent activity section
-        activity_frame = tk.Frame(self.main_frame, bg="white", relief="flat")
+        activity_frame = tk.Frame(parent, bg="white", relief="flat")
         activity_frame.pack(fill="both", expand=True, padx=30, pady=(0, 30))
         
         # Border for shadow
@@ -371,49 +666,62 @@ class FoodManagementGUI:
         tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Load recent orders
-        if self.system:
-            orders = self.system.orders.get_all_orders_details()
-            for order in orders[:10]:  # Show last 10 orders
-                tree.insert("", "end", values=(
-                    order['order_id'],
-                    order['cus_name'],
-                    order['dish_req'][:30] + "..." if len(order['dish_req']) > 30 else order['dish_req'],
-                    f"${order['total_price']:.2f}",
-                    order['status'],
-                    order['order_time']
-                ))
-    
-    def show_customers(self):
-        """Display customers management view"""
-        self.create_crud_view(
+        def recent_values(order):
+            return (
+                order['order_id'],
+                order['cus_name'],
+                ellipsize(order['dish_req']),
+                format_price(order['total_price']),
+                order['status'],
+                order['order_time']
+            )
+        
+        def refresh():
+            if self._stats_dirty:
+                self.refresh_stats()
+            
+            # Load recent orders
+            recent = self.system.orders.get_recent_orders(10) if self.system else []
+            self._fill_tree(tree, recent, recent_values)
+        
+        return refresh
+    
+    def build_customers(self, parent):
+        """Build customers management view"""
+        return self.create_crud_view(
+            parent,
             title="👥 Customer Management",
             columns=("ID", "Name", "Phone"),
-            data_source=lambda: self.system.customers.get_all() if self.system else [],
+            data_source=self.cached_source("customers", ("Customers",),
+                                           lambda: self.system.customers.get_all()),
             add_callback=self.add_customer_dialog,
             edit_callback=self.edit_customer_dialog,
             delete_callback=self.delete_customer,
             color=self.colors['secondary']
         )
     
-    def show_dishes(self):
-        """Display dishes management view"""
-        self.create_crud_view(
+    def build_dishes(self, parent):
+        """Build dishes management view"""
+        return self.create_crud_view(
+            parent,
             title="🍕 Dish Management",
             columns=("ID", "Name", "Recipe", "Time (min)", "Price"),
-            data_source=lambda: self.system.dishes.get_all() if self.system else [],
+            data_source=self.cached_source("dishes", ("Dishes",),
+                                           lambda: self.system.dishes.get_all()),
             add_callback=self.add_dish_dialog,
             edit_callback=self.edit_dish_dialog,
             delete_callback=self.delete_dish,
             color=self.colors['warning']
         )
     
-    def show_ingredients(self):
-        """Display ingredients management view"""
-        self.create_crud_view(
+    def build_ingredients(self, parent):
+        """Build ingredients management view"""
+        return self.create_crud_view(
+            parent,
             title="📦 Ingredient Inventory",
             columns=("ID", "Name", "Stock", "Unit", "Expiry", "Supplier"),
-            data_source=lambda: self.system.ingredients.get_all() if self.system else [],
+            data_source=self.cached_source("ingredients", ("Ingredients",),
+                                           lambda: self.system.ingredients.get_all()),
             add_callback=self.add_ingredient_dialog,
             edit_callback=self.edit_ingredient_dialog,
             delete_callback=self.delete_ingredient,
@@ -421,42 +729,54 @@ class FoodManagementGUI:
             highlight_callback=self.highlight_low_stock
         )
     
-    def show_orders(self):
-        """Display orders management view"""
-        self.create_crud_view(
+    def build_orders(self, parent):
+        """Build orders management view"""
+        return self.create_crud_view(
+            parent,
             title="🛒 Order Management",
             columns=("ID", "Customer", "Items", "Amount", "Status", "Time"),
-            data_source=lambda: self.system.orders.get_all_orders_details() if self.system else [],
+            data_source=self.cached_source("orders", ("Orders", "Customers"),
+                                           lambda: self.system.orders.get_all_orders_details()),
             add_callback=self.new_order_dialog,
             edit_callback=self.edit_order_dialog,
             delete_callback=None,
-            color=self.colors['primary']
+            color=self.colors['primary'],
+            keys=("order_id", "cus_name", "dish_req", "total_price", "status", "order_time")
         )
     
-    def show_employees(self):
-        """Display employees management view"""
-        self.create_crud_view(
+    def build_employees(self, parent):
+        """Build employees management view"""
+        return self.create_crud_view(
+            parent,
             title="👨‍🍳 Employee Management",
             columns=("ID", "Name"),
-            data_source=lambda: self.system.employees.get_all() if self.system else [],
+            data_source=self.cached_source("employees", ("Employees",),
+                                           lambda: self.system.employees.get_all()),
             add_callback=self.add_employee_dialog,
             edit_callback=self.edit_employee_dialog,
             delete_callback=self.delete_employee,
             color=self.colors['info']
         )
     
-    def create_crud_view(self, title, columns, data_source, add_callback, 
-                        edit_callback, delete_callback, color, highlight_callback=None):
-        """Generic CRUD view creator"""
+    def create_crud_view(self, parent, title, columns, data_source, add_callback, 
+                        edit_callback, delete_callback, color, highlight_callback=None,
+                        keys=None):
+        """
+        Generic CRUD view creator, returning the view's refresh function
+        
+        keys names the row field shown in each column; by default the
+        data source's rows already come in column order.
+        """
+        values_of = row_getter(keys)
         # Header
-        header = tk.Frame(self.main_frame, bg="#f5f5f5")
+        header = tk.Frame(parent, bg="#f5f5f5")
         header.pack(fill="x", padx=30, pady=(30, 20))
         
         tk.Label(header, text=title, font=("Segoe UI", 28, "bold"),
                 bg="#f5f5f5", fg=self.colors['dark']).pack(side="left")
         
         # Toolbar
-        toolbar = tk.Frame(self.main_frame, bg="white", relief="flat")
+        toolbar = tk.Frame(parent, bg="white", relief="flat")
         toolbar.pack(fill="x", padx=30, pady=(0, 10))
         
         border = tk.Frame(toolbar, bg="#e0e0e0", padx=2, pady=2)
@@ -496,7 +816,7 @@ class FoodManagementGUI:
             btn_delete.pack(side="right")
         
         # Data table
-        table_frame = tk.Frame(self.main_frame, bg="white", relief="flat")
+        table_frame = tk.Frame(parent, bg="white", relief="flat")
         table_frame.pack(fill="both", expand=True, padx=30, pady=(0, 30))
         
         border2 = tk.Frame(table_frame, bg="#e0e0e0", padx=2, pady=2)
@@ -506,6 +826,8 @@ class FoodManagementGUI:
         content.pack(fill="both", expand=True)
         
         tree = ttk.Treeview(content, columns=columns, show="headings", height=15)
+        for tag, style in ROW_TAG_STYLES.items():
+            tree.tag_configure(tag, **style)
         
         for col in columns:
             tree.heading(col, text=col)
@@ -517,107 +839,231 @@ class FoodManagementGUI:
         tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
         scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
         
-        # Load data
-        self.refresh_table(tree, data_source, highlight_callback)
-        
-        # Search functionality
-        def on_search(*args):
-            search_text = search_var.get().lower()
-            for item in tree.get_children():
-                tree.delete(item)
+        # Search functionality, debounced; rows are fetched and lowercased
+        # once per refresh, not per keystroke
+        pending_search = None
+        # Last filter applied and the (text, row) pairs it matched
+        last_needle = None
+        last_matches = None
+        
+        def on_search():
+            nonlocal pending_search, last_needle, last_matches
+            pending_search = None
+            search_index = self._search_indexes.get(str(tree))
+            if search_index is None:
+                search_index = self._search_indexes[str(tree)] = [
+                    (" ".join(map(str, values_of(row))).lower(), row)
+                    for row in data_source()]
+                last_needle = None
+            
+            needle = search_var.get().lower()
+            if needle == last_needle:
+                return
+            # Typing more only narrows the previous matches
+            if last_needle is not None and needle.startswith(last_needle):
+                candidates = last_matches
+            else:
+                candidates = search_index
+            last_matches = [entry for entry in candidates if needle in entry[0]]
+            last_needle = needle
             
-            data = data_source()
-            for row in data:
-                row_values = tuple(row[col] if col in row.keys() else "" for col in columns)
-                if search_text in str(row_values).lower():
-                    tree.insert("", "end", values=row_values)
+            self._table_snapshots.pop(str(tree), None)
+            self._fill_tree(tree, [row for _, row in last_matches],
+                            values_of, highlight_callback)
+        
+        def schedule_search(*args):
+            nonlocal pending_search
+            if pending_search is not None:
+                self.root.after_cancel(pending_search)
+            pending_search = self.root.after(SEARCH_DELAY_MS, on_search)
+        
+        search_var.trace("w", schedule_search)
+        
+        def refresh():
+            self._search_indexes.pop(str(tree), None)
+            if search_var.get():
+                on_search()
+            else:
+                self.refresh_table(tree, data_source, highlight_callback, values_of)
         
-        search_var.trace("w", on_search)
+        return refresh
     
-    def refresh_table(self, tree, data_source, highlight_callback=None):
-        """Refresh table data"""
-        for item in tree.get_children():
-            tree.delete(item)
-        
+    def refresh_table(self, tree, data_source, highlight_callback=None, values_of=tuple):
+        """
+        Refresh table data, touching only the rows that changed
+        
+        The new rows are diffed against the snapshot of what the tree
+        shows, so an add, edit or delete costs a single insert, item or
+        delete call instead of reloading the table.
+        """
         data = data_source()
-        for row in data:
-            values = tuple(row[col] if col in row.keys() else "" for col in tree["columns"])
-            item_id = tree.insert("", "end", values=values)
-            
-            if highlight_callback:
-                highlight_callback(tree, item_id, row)
+        snapshot = tuple(tuple(row) for row in data)
+        old = self._table_snapshots.get(str(tree))
+        if old == snapshot:
+            return
+        self._table_snapshots[str(tree)] = snapshot
+        
+        if old is None:
+            self._fill_tree(tree, data, values_of, highlight_callback)
+        else:
+            self._patch_tree(tree, old, snapshot, data, values_of, highlight_callback)
     
-    def highlight_low_stock(self, tree, item_id, row):
-        """Highlight low stock items"""
-        if row['stock'] < 10:
-            tree.item(item_id, tags=('low_stock',))
-            tree.tag_configure('low_stock', background='#ffe6e6')
+    def _patch_tree(self, tree, old, new, rows, values_of, highlight_callback=None):
+        """Apply the difference between two snapshots to the tree's items"""
+        tags_of = highlight_callback or (lambda row: ())
+        shown = self._tree_rows[str(tree)]
+        item_ids = tree.get_children()
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        # Work from the end so the indices of earlier items stay valid
+        for op, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if op == "equal":
+                continue
+            common = min(i2 - i1, j2 - j1)
+            for k in range(common):
+                row = rows[j1 + k]
+                values = shown[item_ids[i1 + k]] = values_of(row)
+                tree.item(item_ids[i1 + k], values=values, tags=tags_of(row))
+            if i2 - i1 > common:
+                removed = item_ids[i1 + common:i2]
+                tree.delete(*removed)
+                for item_id in removed:
+                    del shown[item_id]
+            for k in range(common, j2 - j1):
+                row = rows[j1 + k]
+                values = values_of(row)
+                shown[tree.insert("", i1 + k, values=values, tags=tags_of(row))] = values
+    
+    def remove_row(self, tree, item_id):
+        """Drop a row from the tree after it was deleted in the backend"""
+        # A refresh may already have removed it
+        if not tree.exists(item_id):
+            return
+        snapshot = self._table_snapshots.get(str(tree))
+        if snapshot is not None:
+            i = tree.index(item_id)
+            self._table_snapshots[str(tree)] = snapshot[:i] + snapshot[i + 1:]
+        tree.delete(item_id)
+        del self._tree_rows[str(tree)][item_id]
+        # The search index still holds the row; rebuild it on the next search
+        self._search_indexes.pop(str(tree), None)
+    
+    def selected_values(self, tree):
+        """Values of the first selected row, or None when nothing is selected"""
+        selected = tree.selection()
+        if not selected:
+            return None
+        return self._tree_rows[str(tree)][selected[0]]
+    
+    def _fill_tree(self, tree, rows, values_of, highlight_callback=None):
+        """
+        Load rows into tree
+        
+        When the row count is unchanged the existing items are updated in
+        place; otherwise they are removed with a single delete call. Each
+        row costs one Tcl call: highlight_callback returns the row's tags,
+        which are set together with its values.
+        """
+        tags_of = highlight_callback or (lambda row: ())
+        shown = self._tree_rows[str(tree)] = {}
+        item_ids = tree.get_children()
+        if len(item_ids) == len(rows):
+            for item_id, row in zip(item_ids, rows):
+                values = shown[item_id] = values_of(row)
+                tree.item(item_id, values=values, tags=tags_of(row))
+        else:
+            if item_ids:
+                tree.delete(*item_ids)
+            for row in rows:
+                values = values_of(row)
+                shown[tree.insert("", "end", values=values, tags=tags_of(row))] = values
+    
+    def highlight_low_stock(self, row):
+        """Tags low stock items"""
+        return ('low_stock',) if row['stock'] < LOW_STOCK_THRESHOLD else ()
     
     # Dialog methods
+    def confirm_delete(self, message):
+        """Ask through the shared confirm dialog, built on first use"""
+        dialog = self._dialog_cache.get("confirm")
+        if dialog is None:
+            dialog = self._dialog_cache["confirm"] = ConfirmDialog(self.root)
+        return dialog.ask(message)
+    
+    def warn_demo_mode(self):
+        """Shows the demo mode warning; True when there is no backend"""
+        if self._demo_mode:
+            messagebox.showwarning("Demo Mode", "Backend not available")
+        return self._demo_mode
+    
     def add_customer_dialog(self):
+        if self.warn_demo_mode():
+            return
         self.show_form_dialog("Add Customer", [
             ("Name:", "name"),
             ("Phone:", "phone")
-        ], self.save_customer)
+        ], functools.partial(self.save_entity, "customer"))
     
     def add_dish_dialog(self):
+        if self.warn_demo_mode():
+            return
         self.show_form_dialog("Add Dish", [
             ("Name:", "name"),
             ("Recipe:", "recipe"),
             ("Cooking Time (min):", "time"),
             ("Price ($):", "price")
-        ], self.save_dish)
+        ], functools.partial(self.save_entity, "dish"))
     
     def add_ingredient_dialog(self):
+        if self.warn_demo_mode():
+            return
         self.show_form_dialog("Add Ingredient", [
             ("Name:", "name"),
             ("Stock:", "stock"),
             ("Unit:", "unit"),
             ("Expiry (YYYY-MM-DD):", "expiry"),
             ("Supplier:", "supplier")
-        ], self.save_ingredient)
+        ], functools.partial(self.save_entity, "ingredient"))
     
     def add_employee_dialog(self):
+        if self.warn_demo_mode():
+            return
         self.show_form_dialog("Add Employee", [
             ("Name:", "name")
-        ], self.save_employee)
+        ], functools.partial(self.save_entity, "employee"))
+    
+    def get_customers(self):
+        """All customers, loaded once until the next customer write"""
+        if self._customers_cache is None:
+            customers = self.system.customers.get_all()
+            names = [f"{c['cus_name']} ({c['cus_phone']})" for c in customers]
+            self._customers_cache = (customers, names)
+        return self._customers_cache
+    
+    def get_dishes(self):
+        """All dishes with their checkbox labels, loaded once until the next dish write"""
+        if self._dishes_cache is None:
+            dishes = self.system.dishes.get_all()
+            labels = [f"{d['dish_name']} - {format_price(d['dish_price'])}" for d in dishes]
+            self._dishes_cache = (dishes, labels)
+        return self._dishes_cache
     
     def new_order_dialog(self):
         """Create new order dialog"""
-        if not self.system:
-            messagebox.showwarning("Demo Mode", "Backend not available")
+        if self.warn_demo_mode():
             return
         
-        dialog = tk.Toplevel(self.root)
-        dialog.title("New Order")
-        dialog.geometry("600x500")
-        dialog.configure(bg="white")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Center dialog
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (600 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (500 // 2)
-        dialog.geometry(f"600x500+{x}+{y}")
-        
-        # Header
-        header = tk.Frame(dialog, bg=self.colors['primary'], height=80)
-        header.pack(fill="x")
-        
-        tk.Label(header, text="🛒 New Order", font=("Segoe UI", 20, "bold"),
-                bg=self.colors['primary'], fg="white").pack(pady=25)
-        
-        # Form
-        form = tk.Frame(dialog, bg="white")
-        form.pack(fill="both", expand=True, padx=30, pady=30)
+        dialog = BaseDialog(self.root, "New Order", "🛒 New Order", "💾 Create Order",
+                            lambda: save_order(), width=600, height=500,
+                            header_color=self.colors['primary'],
+                            primary_color=self.colors['primary'],
+                            pad=30, button_width=150)
+        form = dialog.body
         
         # Customer selection
         tk.Label(form, text="Customer:", font=("Segoe UI", 11, "bold"),
                 bg="white").grid(row=0, column=0, sticky="w", pady=10)
         
-        customers = self.system.customers.get_all()
-        customer_names = [f"{c['cus_name']} ({c['cus_phone']})" for c in customers]
+        customers, customer_names = self.get_customers()
         customer_var = tk.StringVar()
         customer_combo = ttk.Combobox(form, textvariable=customer_var,
                                      values=customer_names, state="readonly",
@@ -631,26 +1077,26 @@ class FoodManagementGUI:
         dishes_frame = tk.Frame(form, bg="white")
         dishes_frame.grid(row=1, column=1, pady=10, sticky="ew")
         
-        dishes = self.system.dishes.get_all()
-        dish_vars = []
-        total_var = tk.DoubleVar(value=0.0)
-        
-        def update_total():
-            total = sum(dish['dish_price'] * var.get() 
-                       for dish, var in zip(dishes, dish_vars))
-            total_var.set(total)
+        dishes, dish_labels = self.get_dishes()
+        # Checked state is tracked in Python; only the toggle handler reads it
+        selected = [False] * len(dishes)
+        total = 0.0
+        
+        def toggle_dish(i):
+            # Running total: add or subtract only the toggled dish
+            nonlocal total
+            selected[i] = not selected[i]
+            price = dishes[i]['dish_price']
+            total += price if selected[i] else -price
             total_label.configure(text=f"${total:.2f}")
         
-        for dish in dishes:
+        for i, label in enumerate(dish_labels):
             dish_row = tk.Frame(dishes_frame, bg="white")
             dish_row.pack(fill="x", pady=2)
             
-            var = tk.IntVar(value=0)
-            dish_vars.append(var)
-            
-            tk.Checkbutton(dish_row, text=f"{dish['dish_name']} - ${dish['dish_price']:.2f}",
-                          variable=var, bg="white", font=("Segoe UI", 10),
-                          command=update_total).pack(side="left")
+            tk.Checkbutton(dish_row, text=label,
+                          bg="white", font=("Segoe UI", 10),
+                          command=lambda i=i: toggle_dish(i)).pack(side="left")
         
         # Total
         total_frame = tk.Frame(form, bg=self.colors['light'])
@@ -666,375 +1112,315 @@ class FoodManagementGUI:
         
         form.grid_columnconfigure(1, weight=1)
         
-        # Buttons
-        btn_frame = tk.Frame(dialog, bg="white")
-        btn_frame.pack(fill="x", padx=30, pady=(0, 20))
-        
         def save_order():
-            if not customer_var.get():
+            if customer_combo.current() < 0:
                 messagebox.showerror("Error", "Please select a customer")
                 return
             
-            selected_dishes = []
-            for dish, var in zip(dishes, dish_vars):
-                if var.get():
-                    selected_dishes.append(dish['dish_name'])
+            selected_dishes = [dish for dish, checked in zip(dishes, selected) if checked]
             
             if not selected_dishes:
                 messagebox.showerror("Error", "Please select at least one dish")
                 return
             
-            # Get customer ID
-            cus_name = customer_var.get().split(" (")[0]
-            customer = self.system.customers.get_by_phone(
-                customer_var.get().split("(")[1].replace(")", "")
-            )
+            customer = customers[customer_combo.current()]
             
-            # Create order
-            dish_req = ", ".join(selected_dishes)
+            # Create order; items go by dish ID, dish_req is for display
+            dish_req = ", ".join(dish['dish_name'] for dish in selected_dishes)
+            items = [(dish['dish_id'], 1) for dish in selected_dishes]
             order_id = self.system.orders.create_order(
-                dish_req, total_var.get(), customer['cus_id']
+                dish_req, round(total, 2), customer['cus_id'], items
             )
             
             if order_id:
-                messagebox.showinfo("Success", f"Order #{order_id} created successfully!")
+                self.flash(f"Order #{order_id} created")
                 dialog.destroy()
-                self.show_dashboard()
+                self.switch_view("dashboard")
             else:
                 messagebox.showerror("Error", "Failed to create order")
-        
-        btn_save = ModernButton(btn_frame, "💾 Create Order", save_order,
-                               bg_color=self.colors['primary'], width=150)
-        btn_save.pack(side="right", padx=(10, 0))
-        
-        btn_cancel = ModernButton(btn_frame, "✖ Cancel", dialog.destroy,
-                                 bg_color="#95a5a6", width=150)
-        btn_cancel.pack(side="right")
     
     def show_form_dialog(self, title, fields, save_callback):
-        """Generic form dialog"""
-        dialog = tk.Toplevel(self.root)
-        dialog.title(title)
-        dialog.geometry("500x400")
-        dialog.configure(bg="white")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Center dialog
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (500 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (400 // 2)
-        dialog.geometry(f"500x400+{x}+{y}")
-        
-        # Header with gradient effect
-        header = tk.Frame(dialog, bg=self.colors['secondary'], height=80)
-        header.pack(fill="x")
-        
-        tk.Label(header, text=title, font=("Segoe UI", 20, "bold"),
-                bg=self.colors['secondary'], fg="white").pack(pady=25)
-        
-        # Form
-        form = tk.Frame(dialog, bg="white")
-        form.pack(fill="both", expand=True, padx=40, pady=30)
-        
-        entries = {}
-        for i, (label, key) in enumerate(fields):
-            tk.Label(form, text=label, font=("Segoe UI", 11, "bold"),
-                    bg="white").grid(row=i, column=0, sticky="w", pady=10)
-            
-            entry = tk.Entry(form, font=("Segoe UI", 11), relief="solid",
-                           borderwidth=1, width=30)
-            entry.grid(row=i, column=1, pady=10, padx=(10, 0), sticky="ew")
-            entries[key] = entry
-        
-        form.grid_columnconfigure(1, weight=1)
-        
-        # Buttons
-        btn_frame = tk.Frame(dialog, bg="white")
-        btn_frame.pack(fill="x", padx=40, pady=(0, 30))
+        """Generic form dialog, reused with cleared entries after the first call"""
+        dialog = self._dialog_cache.get(title)
+        if dialog is not None:
+            for entry in dialog.entries.values():
+                entry.delete(0, "end")
+            dialog.save_callback = save_callback
+            dialog.reshow()
+            return
         
         def save():
-            data = {key: entry.get() for key, entry in entries.items()}
-            if save_callback(data):
-                dialog.destroy()
-        
-        btn_save = ModernButton(btn_frame, "💾 Save", save,
-                               bg_color=self.colors['success'], width=120)
-        btn_save.pack(side="right", padx=(10, 0))
-        
-        btn_cancel = ModernButton(btn_frame, "✖ Cancel", dialog.destroy,
-                                 bg_color="#95a5a6", width=120)
-        btn_cancel.pack(side="right")
+            # One Tcl round-trip reads every entry
+            values = self.root.tk.splitlist(self.root.tk.eval(read_entries))
+            data = dict(zip(entries, values))
+            if dialog.save_callback(data):
+                dialog.close()
+        
+        dialog = BaseDialog(self.root, title, title, "💾 Save", save, reusable=True)
+        dialog.save_callback = save_callback
+        self._dialog_cache[title] = dialog
+        form = dialog.body
+        
+        entries = dialog.entries = build_entry_form(form, fields)
+        read_entries = "list " + " ".join(f"[{entry} get]" for entry in entries.values())
     
     # Save callbacks
-    def save_customer(self, data):
-        if not self.system:
-            messagebox.showwarning("Demo Mode", "Backend not available")
-            return False
-        
-        if not data['name'] or not data['phone']:
-            messagebox.showerror("Error", "All fields are required")
-            return False
-        
-        if self.system.customers.add(data['name'], data['phone']):
-            messagebox.showinfo("Success", "Customer added successfully!")
-            self.show_customers()
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to add customer")
-            return False
+    def call_on_main(self, func, *args):
+        """Queue func(*args) to run on the Tk thread; safe from any thread"""
+        self._main_queue.put((func, args))
     
-    def save_dish(self, data):
-        if not self.system:
-            messagebox.showwarning("Demo Mode", "Backend not available")
-            return False
-        
-        try:
-            cooking_time = int(data['time'])
-            price = float(data['price'])
-        except ValueError:
-            messagebox.showerror("Error", "Invalid time or price")
-            return False
-        
-        if self.system.dishes.add(data['name'], data['recipe'], cooking_time, price):
-            messagebox.showinfo("Success", "Dish added successfully!")
-            self.show_dishes()
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to add dish")
-            return False
+    def drain_main_queue(self):
+        """Run the callbacks queued by worker threads, then poll again"""
+        while True:
+            try:
+                func, args = self._main_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception:
+                logger.exception("Queued callback %r failed", func)
+        self.root.after(MAIN_QUEUE_POLL_MS, self.drain_main_queue)
     
-    def save_ingredient(self, data):
-        if not self.system:
-            messagebox.showwarning("Demo Mode", "Backend not available")
-            return False
-        
-        try:
-            stock = float(data['stock'])
-        except ValueError:
-            messagebox.showerror("Error", "Invalid stock amount")
-            return False
-        
-        if self.system.ingredients.add(data['name'], stock, data['unit'], 
-                                       data['expiry'], data['supplier']):
-            messagebox.showinfo("Success", "Ingredient added successfully!")
-            self.show_ingredients()
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to add ingredient")
-            return False
+    def run_in_background(self, on_done, func, *args):
+        """Run func(*args) on the I/O pool, then on_done(result) on the Tk thread"""
+        future = self._io_executor.submit(func, *args)
+        future.add_done_callback(
+            lambda f: self.call_on_main(self._finish_background, f, on_done))
     
-    def save_employee(self, data):
-        if not self.system:
-            messagebox.showwarning("Demo Mode", "Backend not available")
+    def _finish_background(self, future, on_done):
+        # A raised backend error counts as a failed write
+        error = future.exception()
+        if error is not None:
+            logger.error("Background write failed: %s", error, exc_info=error)
+        on_done(error is None and future.result())
+    
+    def save_entity(self, kind, data):
+        """Validate an add form and save it through the matching manager"""
+        assert not self._demo_mode
+        parser, invalid_msg, name, noun, cache_attr = SAVE_SPECS[kind]
+        
+        args = parser(data)
+        if args is None:
+            messagebox.showerror("Error", invalid_msg)
             return False
         
-        if self.system.employees.add(data['name']):
-            messagebox.showinfo("Success", "Employee added successfully!")
-            self.show_employees()
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to add employee")
-            return False
+        def done(ok):
+            if ok:
+                if cache_attr:
+                    setattr(self, cache_attr, None)
+                self.flash(f"{noun} added")
+                # Only reload the view if the user is still on it
+                if self._current_view == name:
+                    self._views[name][1]()
+            else:
+                messagebox.showerror("Error", f"Failed to add {noun.lower()}")
+        
+        # The dialog closes right away; the result is reported when the add finishes
+        self.run_in_background(done, getattr(self.system, name).add, *args)
+        return True
     
     # Edit callbacks
     def edit_customer_dialog(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select a customer to edit")
             return
         
-        values = tree.item(selected[0])['values']
         # Implementation similar to add but with pre-filled values
-        messagebox.showinfo("Edit", f"Editing customer: {values[1]}")
+        self.flash(f"Editing customer: {values[1]}", self.colors['info'])
     
     def edit_dish_dialog(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select a dish to edit")
             return
         
-        values = tree.item(selected[0])['values']
-        messagebox.showinfo("Edit", f"Editing dish: {values[1]}")
+        self.flash(f"Editing dish: {values[1]}", self.colors['info'])
     
     def edit_ingredient_dialog(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select an ingredient to edit")
             return
         
-        values = tree.item(selected[0])['values']
-        messagebox.showinfo("Edit", f"Editing ingredient: {values[1]}")
+        self.flash(f"Editing ingredient: {values[1]}", self.colors['info'])
     
     def edit_employee_dialog(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select an employee to edit")
             return
         
-        values = tree.item(selected[0])['values']
-        messagebox.showinfo("Edit", f"Editing employee: {values[1]}")
+        self.flash(f"Editing employee: {values[1]}", self.colors['info'])
     
     def edit_order_dialog(self, tree):
-        selected = tree.selection()
-        if not selected:
+        if self.warn_demo_mode():
+            return
+        
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select an order to edit")
             return
         
-        values = tree.item(selected[0])['values']
         order_id = values[0]
         
-        # Status update dialog
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Update Order Status")
-        dialog.geometry("400x300")
-        dialog.configure(bg="white")
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        # Center dialog
-        dialog.update_idletasks()
-        x = (dialog.winfo_screenwidth() // 2) - (400 // 2)
-        y = (dialog.winfo_screenheight() // 2) - (300 // 2)
-        dialog.geometry(f"400x300+{x}+{y}")
+        # Status update dialog, built once and retargeted on later calls
+        dialog = self._dialog_cache.get("order_status")
+        if dialog is not None:
+            dialog.order_id = order_id
+            dialog.header_label.configure(text=f"Update Order #{order_id}")
+            dialog.status_var.set(ORDER_STATUSES[0])
+            dialog.reshow()
+            return
         
-        # Header
-        header = tk.Frame(dialog, bg=self.colors['primary'], height=70)
-        header.pack(fill="x")
+        def update_status():
+            if self.system.orders.update_status(dialog.order_id, status_var.get()):
+                self.flash("Order status updated")
+                dialog.close()
+                self.switch_view("orders")
+            else:
+                messagebox.showerror("Error", "Failed to update status")
         
-        tk.Label(header, text=f"Update Order #{order_id}", 
-                font=("Segoe UI", 18, "bold"),
-                bg=self.colors['primary'], fg="white").pack(pady=20)
+        dialog = BaseDialog(self.root, "Update Order Status", f"Update Order #{order_id}",
+                            "✔ Update", update_status, width=400, height=300,
+                            header_color=self.colors['primary'],
+                            header_font_size=18, pad=30, reusable=True)
+        dialog.order_id = order_id
+        self._dialog_cache["order_status"] = dialog
         
         # Status selection
-        form = tk.Frame(dialog, bg="white")
-        form.pack(fill="both", expand=True, padx=30, pady=30)
+        form = dialog.body
         
         tk.Label(form, text="New Status:", font=("Segoe UI", 12, "bold"),
                 bg="white").pack(pady=10)
         
-        status_var = tk.StringVar(value="Pending")
-        statuses = ["Pending", "Preparing", "Ready", "Delivered", "Cancelled"]
-        
-        for status in statuses:
-            rb = tk.Radiobutton(form, text=status, variable=status_var,
-                               value=status, font=("Segoe UI", 11),
-                               bg="white")
-            rb.pack(anchor="w", pady=5)
-        
-        # Buttons
-        btn_frame = tk.Frame(dialog, bg="white")
-        btn_frame.pack(fill="x", padx=30, pady=(0, 20))
-        
-        def update_status():
-            if self.system:
-                if self.system.orders.update_status(order_id, status_var.get()):
-                    messagebox.showinfo("Success", "Order status updated!")
-                    dialog.destroy()
-                    self.show_orders()
-                else:
-                    messagebox.showerror("Error", "Failed to update status")
-            else:
-                messagebox.showwarning("Demo Mode", "Backend not available")
-        
-        btn_update = ModernButton(btn_frame, "✔ Update", update_status,
-                                 bg_color=self.colors['success'], width=120)
-        btn_update.pack(side="right", padx=(10, 0))
-        
-        btn_cancel = ModernButton(btn_frame, "✖ Cancel", dialog.destroy,
-                                 bg_color="#95a5a6", width=120)
-        btn_cancel.pack(side="right")
+        status_var = dialog.status_var = tk.StringVar(value=ORDER_STATUSES[0])
+        status_combo = ttk.Combobox(form, textvariable=status_var,
+                                    values=ORDER_STATUSES, state="readonly",
+                                    font=("Segoe UI", 12))
+        status_combo.pack(fill="x", pady=10)
     
     # Delete callbacks
     def delete_customer(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select a customer to delete")
             return
         
-        values = tree.item(selected[0])['values']
         cus_id = values[0]
         
-        if messagebox.askyesno("Confirm Delete", 
-                               f"Are you sure you want to delete {values[1]}?"):
-            if self.system and self.system.customers.delete(cus_id):
-                messagebox.showinfo("Success", "Customer deleted successfully!")
-                self.show_customers()
-            else:
-                messagebox.showerror("Error", "Failed to delete customer")
+        if self.confirm_delete(f"Are you sure you want to delete {values[1]}?"):
+            item_id = tree.selection()[0]
+            
+            def done(ok):
+                if ok:
+                    self._customers_cache = None
+                    self.remove_row(tree, item_id)
+                    self.flash("Customer deleted")
+                else:
+                    messagebox.showerror("Error", "Failed to delete customer")
+            
+            self.run_in_background(done, self.system.customers.delete, cus_id)
     
     def delete_dish(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select a dish to delete")
             return
         
-        values = tree.item(selected[0])['values']
         dish_id = values[0]
         
-        if messagebox.askyesno("Confirm Delete", 
-                               f"Are you sure you want to delete {values[1]}?"):
-            if self.system and self.system.dishes.delete(dish_id):
-                messagebox.showinfo("Success", "Dish deleted successfully!")
-                self.show_dishes()
-            else:
-                messagebox.showerror("Error", "Failed to delete dish")
+        if self.confirm_delete(f"Are you sure you want to delete {values[1]}?"):
+            item_id = tree.selection()[0]
+            
+            def done(ok):
+                if ok:
+                    self._dishes_cache = None
+                    self.remove_row(tree, item_id)
+                    self.flash("Dish deleted")
+                else:
+                    messagebox.showerror("Error", "Failed to delete dish")
+            
+            self.run_in_background(done, self.system.dishes.delete, dish_id)
     
     def delete_ingredient(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select an ingredient to delete")
             return
         
-        values = tree.item(selected[0])['values']
         ingre_id = values[0]
         
-        if messagebox.askyesno("Confirm Delete", 
-                               f"Are you sure you want to delete {values[1]}?"):
-            if self.system and self.system.ingredients.delete(ingre_id):
-                messagebox.showinfo("Success", "Ingredient deleted successfully!")
-                self.show_ingredients()
-            else:
-                messagebox.showerror("Error", "Failed to delete ingredient")
+        if self.confirm_delete(f"Are you sure you want to delete {values[1]}?"):
+            item_id = tree.selection()[0]
+            
+            def done(ok):
+                if ok:
+                    self.remove_row(tree, item_id)
+                    self.flash("Ingredient deleted")
+                else:
+                    messagebox.showerror("Error", "Failed to delete ingredient")
+            
+            self.run_in_background(done, self.system.ingredients.delete, ingre_id)
     
     def delete_employee(self, tree):
-        selected = tree.selection()
-        if not selected:
+        values = self.selected_values(tree)
+        if values is None:
             messagebox.showwarning("Warning", "Please select an employee to delete")
             return
         
-        values = tree.item(selected[0])['values']
         emp_id = values[0]
         
-        if messagebox.askyesno("Confirm Delete", 
-                               f"Are you sure you want to delete {values[1]}?"):
-            if self.system and self.system.employees.delete(emp_id):
-                messagebox.showinfo("Success", "Employee deleted successfully!")
-                self.show_employees()
-            else:
-                messagebox.showerror("Error", "Failed to delete employee")
-    
-    def animate_cards(self):
-        """Animate dashboard cards with random updates"""
-        if hasattr(self, 'stat_cards') and self.stat_cards:
-            # Simulate live updates (for demo purposes)
-            if random.random() > 0.7:  # 30% chance to update
-                card_idx = random.randint(0, len(self.stat_cards) - 1)
-                card = self.stat_cards[card_idx]
-                
-                # Add small random change to value
-                current_text = card.value_label.cget("text")
-                if "$" in current_text:
-                    try:
-                        value = float(current_text.replace("$", "").replace(",", ""))
-                        change = random.uniform(-10, 20)
-                        new_value = value + change
-                        card.update_value(f"${new_value:,.2f}")
-                    except:
-                        pass
-        
-        # Schedule next animation
-        self.root.after(3000, self.animate_cards)
+        if self.confirm_delete(f"Are you sure you want to delete {values[1]}?"):
+            item_id = tree.selection()[0]
+            
+            def done(ok):
+                if ok:
+                    self.remove_row(tree, item_id)
+                    self.flash("Employee deleted")
+                else:
+                    messagebox.showerror("Error", "Failed to delete employee")
+            
+            self.run_in_background(done, self.system.employees.delete, emp_id)
+    
+    def refresh_stats(self):
+        """Recompute the dashboard stat cards"""
+        # Get actual data if backend available; counts and totals come from SQL
+        if self.system:
+            total_orders, revenue = self.system.orders.get_stats()
+            total_customers = self.system.customers.count()
+            total_dishes = self.system.dishes.count()
+        else:
+            total_orders = revenue = total_customers = total_dishes = 0
+        
+        values = (f"${revenue:,.2f}", str(total_orders),
+                  str(total_customers), str(total_dishes))
+        for card, value in zip(self.stat_cards, values):
+            card.update_value(value)
+        self._stats_dirty = False
+    
+    def on_data_changed(self, table):
+        """
+        Backend change listener
+        
+        Background writes bump versions on a worker thread, so this only
+        queues mark_stats_stale for the Tk thread and touches no GUI state.
+        """
+        if table in DASHBOARD_TABLES:
+            self.call_on_main(self.mark_stats_stale)
+    
+    def mark_stats_stale(self):
+        """Flag the dashboard for reloading, reloading now if it is on screen"""
+        self._stats_dirty = True
+        if self._current_view == "dashboard":
+            self._views["dashboard"][1]()
+    
+    def poll_stats(self):
+        """Periodic fallback for changes the backend did not report"""
+        self._source_cache.clear()
+        self.mark_stats_stale()
+        self.root.after(STATS_REFRESH_MS, self.poll_stats)
 
 
 def main():
@@ -1049,17 +1435,19 @@ def main():
     
     app = FoodManagementGUI(root)
     
-    # Smooth startup animation
-    root.attributes('-alpha', 0.0)
-    root.update()
-    
-    def fade_in(alpha=0.0):
-        if alpha < 1.0:
-            alpha += 0.1
-            root.attributes('-alpha', alpha)
-            root.after(30, lambda: fade_in(alpha))
-    
-    fade_in()
+    # Smooth startup animation; only X11 gets a fade, other window
+    # managers already animate the window appearing
+    if root.tk.call("tk", "windowingsystem") == "x11":
+        alpha = [0.0]
+        root.attributes('-alpha', 0.0)
+        
+        def fade_in():
+            alpha[0] = min(alpha[0] + FADE_STEP, 1.0)
+            root.attributes('-alpha', alpha[0])
+            if alpha[0] < 1.0:
+                root.after(FADE_MS, fade_in)
+        
+        root.after_idle(fade_in)
     
     root.mainloop()
 
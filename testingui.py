@@ -17,23 +17,12 @@ class Selection_Frame(customtkinter.CTkFrame):
         self.Label.pack(pady=30)
 
 
-        self.buttonA = customtkinter.CTkButton(self, text="buttonA", font=("Arial", 24), height=50, width = 250)
-        self.buttonA.pack(pady=30)
-
-        self.buttonB = customtkinter.CTkButton(self, text="buttonB", font=("Arial", 24), height=50, width = 250)
-        self.buttonB.pack(pady=30)
-
-        self.buttonC = customtkinter.CTkButton(self, text="buttonC", font=("Arial", 24), height=50, width = 250)
-        self.buttonC.pack(pady=30)
-
-        self.buttonD = customtkinter.CTkButton(self, text="buttonD", font=("Arial", 24), height=50, width = 250)
-        self.buttonD.pack(pady=30)
-
-        self.buttonE = customtkinter.CTkButton(self, text="buttonE", font=("Arial", 24), height=50, width = 250)
-        self.buttonE.pack(pady=30)
-
-        self.buttonF = customtkinter.CTkButton(self, text="buttonF", font=("Arial", 24), height=50, width = 250)
-        self.buttonF.pack(pady=30)
+        # 1 font cho ca 6 nut
+        self._btn_font = customtkinter.CTkFont(family="Arial", size=24)
+        for name in "ABCDEF":
+            btn = customtkinter.CTkButton(self, text=f"button{name}", font=self._btn_font, height=50, width = 250)
+            btn.pack(pady=30)
+            setattr(self, f"button{name}", btn)
     
     def Afunc(self):
         pass
@@ -64,5 +53,6 @@ class Root(customtkinter.CTk):
         self.SelectionBar = Selection_Frame(master=self)
         self.SelectionBar.grid(row=0, column=0, padx=20, pady=20)
 
-root = Root()
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    root = Root()
+    root.mainloop()
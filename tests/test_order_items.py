@@ -0,0 +1,77 @@
+"""
+OrderItems with duplicate dish names
+
+Run with: python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from claude_logic import FoodManagementSystem, parse_dish_req
+
+
+class DuplicateDishNameTest(unittest.TestCase):
+    """Two dishes named "Pizza" plus one whose name contains a comma"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = os.path.join(self.tmp, "food.db")
+        # The shipped database has no OrderItems yet, so opening it runs
+        # the backfill migration
+        shutil.copy(os.path.join(ROOT, "food_db.db"), self.db)
+        conn = sqlite3.connect(self.db)
+        with conn:
+            self.pizza_ids = [row[0] for row in conn.execute(
+                "SELECT dish_id FROM Dishes WHERE dish_name = 'Pizza'")]
+            conn.execute("INSERT INTO Dishes (dish_name, recipe, cooking_time, dish_price) "
+                         "VALUES ('Pizza', 'r', 5, 9.0)")
+            conn.execute("INSERT INTO Dishes (dish_name, recipe, cooking_time, dish_price) "
+                         "VALUES ('Mì, cay', 'r', 5, 4.0)")
+            self.noodle_id = conn.execute(
+                "SELECT dish_id FROM Dishes WHERE dish_name = 'Mì, cay'").fetchone()[0]
+            self.cus_id = conn.execute("SELECT MIN(cus_id) FROM Customers").fetchone()[0]
+            self.old_order = conn.execute(
+                "INSERT INTO Orders (dish_req, total_price, order_time, status, cus_id) "
+                "VALUES ('Pizza (x2), Mì, cay (x3)', 30.0, '2024-01-01 12:00:00', "
+                "'Pending', ?)", (self.cus_id,)).lastrowid
+        conn.close()
+        self.system = FoodManagementSystem(self.db)
+
+    def tearDown(self):
+        self.system.db_manager.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def items_of(self, order_id):
+        rows = self.system.db_manager.execute_query(
+            "SELECT dish_id, qty FROM OrderItems WHERE order_id = ? ORDER BY dish_id",
+            (order_id,))
+        return [tuple(row) for row in rows]
+
+    def test_backfill_picks_one_dish_per_name(self):
+        self.assertEqual(self.items_of(self.old_order),
+                         sorted([(min(self.pizza_ids), 2), (self.noodle_id, 3)]))
+
+    def test_create_order_uses_dish_ids(self):
+        dish_ids = [row[0] for row in self.system.db_manager.execute_query(
+            "SELECT dish_id FROM Dishes WHERE dish_name = 'Pizza'")]
+        order_id = self.system.orders.create_order(
+            "Pizza, Pizza", 18.0, self.cus_id, [(dish_ids[-1], 1), (dish_ids[-1], 1)])
+        self.assertIsNotNone(order_id)
+        self.assertEqual(self.items_of(order_id), [(dish_ids[-1], 2)])
+
+    def test_parse_keeps_names_with_commas(self):
+        self.assertEqual(parse_dish_req("Mì, cay (x3), Pizza", {"Mì, cay", "Pizza"}),
+                         [("Mì, cay", 3), ("Pizza", 1)])
+        self.assertEqual(parse_dish_req("Burger gà (x1), Pizza (x5)"),
+                         [("Burger gà", 1), ("Pizza", 5)])
+
+
+if __name__ == "__main__":
+    unittest.main()